@@ -0,0 +1,77 @@
+"""Замеры всех маршрутов blog и pages на большом синтетическом наборе.
+
+Запуск: pytest benchmarks. Результаты сравниваются с baseline.json,
+обновить его: BENCH_UPDATE_BASELINE=1 pytest benchmarks. Рост числа
+запросов и строк проваливает тест, рост времени и памяти отмечается
+в отчёте.
+"""
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from benchmarks.measurement import (
+    BASELINE_PATH,
+    UPDATE_BASELINE,
+    advisories,
+    load_baseline,
+    results
+)
+
+SEED_OPTIONS = {
+    'users': int(os.environ.get('BENCH_USERS', 2_000)),
+    'categories': 50,
+    'locations': 200,
+    'posts': int(os.environ.get('BENCH_POSTS', 20_000)),
+    'comments': int(os.environ.get('BENCH_COMMENTS', 50_000)),
+    'seed': 1,
+}
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        with open(os.devnull, 'w') as devnull:
+            call_command('seed_scale', stdout=devnull, **SEED_OPTIONS)
+
+
+@pytest.fixture(autouse=True)
+def enable_debug_false(tmp_path):
+    with override_settings(
+        DEBUG=False,
+        CACHE_SHARED=True,
+        QUERY_STATS_DIR=tmp_path / 'query_stats',
+        MEMORY_STATS_DIR=tmp_path / 'memory_stats'
+    ):
+        yield
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if UPDATE_BASELINE and results:
+        baseline = load_baseline()
+        baseline.update(results)
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, ensure_ascii=False, sort_keys=True)
+            + '\n'
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not results:
+        return
+    terminalreporter.section('benchmarks')
+    terminalreporter.write_line(
+        f'{"маршрут":<28}{"мс":>10}{"запросов":>10}{"строк":>8}{"КБ":>10}'
+    )
+    for name, row in sorted(results.items()):
+        terminalreporter.write_line(
+            f'{name:<28}{row["time_ms"]:>10.1f}{row["queries"]:>10}'
+            f'{row["rows"]:>8}{row["peak_kb"]:>10.1f}'
+            + (' !' if name in advisories else '')
+        )
+    for name, slower in sorted(advisories.items()):
+        terminalreporter.write_line(
+            f'! {name} медленнее baseline: ' + '; '.join(slower)
+        )
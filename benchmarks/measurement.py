@@ -0,0 +1,128 @@
+"""Замер запроса и сравнение с baseline.json.
+
+Число SQL-запросов и созданных моделей не зависит от машины, поэтому
+их рост относительно baseline.json проваливает тест. Время и пик памяти
+шумят от запуска к запуску и сравниваются только для отчёта.
+"""
+import json
+import os
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+from typing import NamedTuple
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_init
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+N_RUNS = int(os.environ.get('BENCH_RUNS', 5))
+# Заметное ухудшение времени и памяти относительно baseline.json,
+# в процентах; о нём только предупреждаем
+MAX_REGRESSION = float(os.environ.get('BENCH_MAX_REGRESSION', 25))
+UPDATE_BASELINE = os.environ.get('BENCH_UPDATE_BASELINE') == '1'
+# Метрики, рост которых проваливает тест
+CHECKED_METRICS = ('queries', 'rows')
+# Метрики, зависящие от машины и нагрузки на неё
+ADVISORY_METRICS = ('time_ms', 'peak_kb')
+
+
+class BenchmarkWarning(UserWarning):
+    pass
+
+
+class Measurement(NamedTuple):
+    time_ms: float
+    queries: int
+    rows: int
+    peak_kb: float
+
+
+results = {}
+advisories = {}
+
+
+def measure_once(request, setup, trace_memory=False):
+    arg = setup() if setup else None
+    queries = rows = 0
+
+    def count_query(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    def count_row(**kwargs):
+        nonlocal rows
+        rows += 1
+
+    # Замеряем некешированный путь: кеши скрывают регрессии
+    cache.clear()
+    post_init.connect(count_row, weak=False)
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        with connection.execute_wrapper(count_query):
+            response = request(arg)
+    finally:
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if trace_memory:
+            tracemalloc.stop()
+        post_init.disconnect(count_row)
+    assert response.status_code < 400, response.status_code
+    return Measurement(elapsed * 1000, queries, rows, peak / 1024)
+
+
+def measure(name, request, setup=None):
+    """Медиана времени N_RUNS запусков и память отдельного запуска.
+
+    setup выполняется перед каждым запуском вне замера, его результат
+    передаётся в request. tracemalloc сильно замедляет код, поэтому
+    пик памяти снимается отдельным запуском.
+    """
+    times = sorted(
+        measure_once(request, setup).time_ms for _ in range(N_RUNS)
+    )
+    measurement = measure_once(request, setup, trace_memory=True)._replace(
+        time_ms=times[len(times) // 2]
+    )
+    results[name] = measurement._asdict()
+    return measurement
+
+
+def load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def assert_no_regression(name, measurement):
+    if UPDATE_BASELINE:
+        return
+    baseline = load_baseline().get(name)
+    if baseline is None:
+        pytest.skip(f'Для {name} нет записи в {BASELINE_PATH.name}')
+    limit = 1 + MAX_REGRESSION / 100
+    slower = [
+        f'{metric}: {getattr(measurement, metric):.1f} > '
+        f'{baseline[metric]:.1f} * {limit:.2f}'
+        for metric in ADVISORY_METRICS
+        if getattr(measurement, metric) > baseline[metric] * limit
+        # Мелкие абсолютные значения сильно шумят
+        and getattr(measurement, metric) - baseline[metric] > 1
+    ]
+    if slower:
+        advisories[name] = slower
+        warnings.warn(
+            f'Возможная регрессия {name}: ' + '; '.join(slower),
+            BenchmarkWarning
+        )
+    regressions = [
+        f'{metric}: {getattr(measurement, metric)} > {baseline[metric]}'
+        for metric in CHECKED_METRICS
+        if getattr(measurement, metric) > baseline[metric]
+    ]
+    assert not regressions, f'Регрессия {name}: ' + '; '.join(regressions)
@@ -0,0 +1,174 @@
+import pytest
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+from django.utils.timezone import now
+
+from blog.models import Category, Comment, Post, User
+from benchmarks.measurement import assert_no_regression, measure
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def author():
+    return User.objects.annotate(
+        n_posts=Count('posts')
+    ).order_by('-n_posts').first()
+
+
+@pytest.fixture
+def author_client(author):
+    client = Client()
+    client.force_login(author)
+    return client
+
+
+@pytest.fixture
+def viral_post():
+    return Post.objects.filter_valid().annotate(
+        n_comments=Count('comments')
+    ).order_by('-n_comments').first()
+
+
+@pytest.fixture
+def own_post(author):
+    return Post.objects.filter_valid().filter(author=author).first()
+
+
+@pytest.fixture
+def post_form_data(own_post):
+    return {
+        'title': 'Заголовок',
+        'text': 'Текст публикации',
+        'pub_date': now().strftime('%Y-%m-%d %H:%M'),
+        'category': own_post.category_id,
+        'is_published': True,
+    }
+
+
+def make_post(author):
+    return Post.objects.create(
+        title='Удаляемая', text='Текст', author=author
+    )
+
+
+def make_comment(post, author):
+    return Comment.objects.create(text='Комментарий', post=post, author=author)
+
+
+def bench(name, request, setup=None):
+    assert_no_regression(name, measure(name, request, setup))
+
+
+@pytest.mark.parametrize('name, url', (
+    ('pages:about', '/pages/about/'),
+    ('pages:rules', '/pages/rules/'),
+    ('blog:index', '/'),
+))
+def test_static_urls(client, name, url):
+    bench(name, lambda _: client.get(url))
+
+
+def test_index_deep_page(client):
+    n_pages = Post.objects.filter_valid().count() // 10
+    url = f'/?page={n_pages // 2}'
+    bench('blog:index (deep page)', lambda _: client.get(url))
+
+
+def test_category_posts(client):
+    category = Category.objects.filter(is_published=True).annotate(
+        n_posts=Count('posts')
+    ).order_by('-n_posts').first()
+    url = reverse('blog:category_posts', args=[category.slug])
+    bench('blog:category_posts', lambda _: client.get(url))
+
+
+def test_profile(client, author):
+    url = reverse('blog:profile', args=[author.username])
+    bench('blog:profile', lambda _: client.get(url))
+
+
+def test_own_profile(author_client, author):
+    url = reverse('blog:profile', args=[author.username])
+    bench('blog:profile (own)', lambda _: author_client.get(url))
+
+
+def test_post_detail(client, viral_post):
+    url = reverse('blog:post_detail', args=[viral_post.id])
+    bench('blog:post_detail', lambda _: client.get(url))
+
+
+def test_post_detail_authenticated(author_client, viral_post):
+    url = reverse('blog:post_detail', args=[viral_post.id])
+    bench('blog:post_detail (logged in)', lambda _: author_client.get(url))
+
+
+def test_create_post(author_client, post_form_data):
+    url = reverse('blog:create_post')
+    bench('blog:create_post', lambda _: author_client.get(url))
+    bench(
+        'blog:create_post (POST)',
+        lambda _: author_client.post(url, post_form_data)
+    )
+
+
+def test_edit_post(author_client, own_post, post_form_data):
+    url = reverse('blog:edit_post', args=[own_post.id])
+    bench('blog:edit_post', lambda _: author_client.get(url))
+    bench(
+        'blog:edit_post (POST)',
+        lambda _: author_client.post(url, post_form_data)
+    )
+
+
+def test_delete_post(author_client, author):
+    bench('blog:delete_post', lambda post: author_client.get(
+        reverse('blog:delete_post', args=[post.id])
+    ), setup=lambda: make_post(author))
+    bench('blog:delete_post (POST)', lambda post: author_client.post(
+        reverse('blog:delete_post', args=[post.id])
+    ), setup=lambda: make_post(author))
+
+
+def test_add_comment(author_client, viral_post):
+    url = reverse('blog:add_comment', args=[viral_post.id])
+    bench(
+        'blog:add_comment (POST)',
+        lambda _: author_client.post(url, {'text': 'Комментарий'})
+    )
+
+
+def test_edit_comment(author_client, author, viral_post):
+    comment = make_comment(viral_post, author)
+    url = reverse('blog:edit_comment', args=[viral_post.id, comment.id])
+    bench('blog:edit_comment', lambda _: author_client.get(url))
+    bench(
+        'blog:edit_comment (POST)',
+        lambda _: author_client.post(url, {'text': 'Изменённый'})
+    )
+
+
+def test_delete_comment(author_client, author, viral_post):
+    def url(comment):
+        return reverse(
+            'blog:delete_comment', args=[viral_post.id, comment.id]
+        )
+
+    bench(
+        'blog:delete_comment',
+        lambda comment: author_client.get(url(comment)),
+        setup=lambda: make_comment(viral_post, author)
+    )
+    bench(
+        'blog:delete_comment (POST)',
+        lambda comment: author_client.post(url(comment)),
+        setup=lambda: make_comment(viral_post, author)
+    )
+
+
+def test_edit_profile(author_client):
+    bench(
+        'blog:edit_profile',
+        lambda _: author_client.get(reverse('blog:edit_profile'))
+    )
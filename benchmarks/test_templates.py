@@ -0,0 +1,73 @@
+"""Время рендера страниц: каждый раз с диска и из кеша загрузчика."""
+import pytest
+from django.http import HttpResponse
+from django.template import Engine, RequestContext, engines
+from django.test import Client
+from django.urls import reverse
+
+from blog.models import Category, Post, User
+from blog.warmup import warm_up_templates
+from benchmarks.measurement import assert_no_regression, measure
+
+pytestmark = pytest.mark.django_db
+
+UNCACHED_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_uncached_engine(engine):
+    return Engine(
+        dirs=engine.dirs,
+        loaders=UNCACHED_LOADERS,
+        context_processors=engine.context_processors,
+        libraries=engine.libraries,
+    )
+
+
+@pytest.fixture(params=['index', 'category', 'profile', 'post_detail'])
+def page(request):
+    """Шаблон страницы и контекст её настоящего ответа."""
+    urls = {
+        'index': lambda: reverse('blog:index'),
+        'category': lambda: reverse(
+            'blog:category_posts',
+            args=[Category.objects.filter(is_published=True).first().slug]
+        ),
+        'profile': lambda: reverse(
+            'blog:profile',
+            args=[User.objects.filter(posts__isnull=False).first().username]
+        ),
+        'post_detail': lambda: reverse(
+            'blog:post_detail',
+            args=[Post.objects.filter_valid().first().id]
+        ),
+    }
+    # Анонимам страница может отдаться из общего кеша без рендера
+    client = Client()
+    client.force_login(User.objects.first())
+    response = client.get(urls[request.param]())
+    return (
+        request.param,
+        response.templates[0].name,
+        response.wsgi_request,
+        response.context[0].flatten()
+    )
+
+
+@pytest.mark.parametrize('cached', [False, True], ids=['disk', 'cached'])
+def test_render(page, cached):
+    name, template_name, request, context = page
+    engine = engines['django'].engine
+    if cached:
+        warm_up_templates()
+    else:
+        engine = make_uncached_engine(engine)
+
+    def render(arg):
+        template = engine.get_template(template_name)
+        return HttpResponse(template.render(RequestContext(request, context)))
+
+    bench_name = f'render_{name}_{"cached" if cached else "disk"}'
+    assert_no_regression(bench_name, measure(bench_name, render))
@@ -0,0 +1,27 @@
+"""Построение адресов публикаций: reverse() против build_url()."""
+import pytest
+from django.http import HttpResponse
+from django.urls import reverse
+
+from blog.urlbuilder import build_url
+from benchmarks.measurement import assert_no_regression, measure
+
+# Сто страниц ленты по четыре адреса на каждую из десяти карточек
+N_URLS = 4_000
+BUILDERS = {
+    'reverse': lambda post_id: reverse('blog:post_detail', args=[post_id]),
+    'build_url': lambda post_id: build_url('blog:post_detail', post_id),
+}
+
+
+@pytest.mark.parametrize('name', BUILDERS)
+def test_post_urls(name):
+    make_url = BUILDERS[name]
+
+    def build(arg):
+        return HttpResponse(
+            ''.join(make_url(post_id) for post_id in range(N_URLS))
+        )
+
+    bench_name = f'urls_{name}'
+    assert_no_regression(bench_name, measure(bench_name, build))
@@ -1,8 +1,215 @@
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.admin.utils import model_ngettext
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.text import Truncator
 
-from .models import Category, Location, Post, Comment
+from .models import Category, Location, Post, Comment, User
+from .moderation import Moderation
+from .pagination import CappedCountPaginator
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+MAX_TEXT_LENGTH = 80
+
+
+class PrefixAutocompleteMixin:
+    """Автодополнение по началу значения полей prefix_search_fields.
+
+    Поиск списка остаётся стандартным по search_fields, а запросы
+    автодополнения полей-ссылок ищут введённую строку целиком через
+    blog.lookups.Prefix, который использует индекс поля. Prefix учитывает
+    регистр, поэтому проверяются и варианты со строчной и заглавной
+    первой буквой.
+    """
+
+    prefix_search_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term or request.path != reverse(
+            f'{self.admin_site.name}:autocomplete'
+        ):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        condition = Q()
+        for field in self.prefix_search_fields:
+            for variant in {term, term.lower(), term.capitalize()}:
+                condition |= Q(**{f'{field}__prefix': variant})
+        return queryset.filter(condition), False
+
+
+class PublishActionsMixin:
+    """Массовая публикация и снятие с публикации, см. blog.moderation."""
+
+    actions = ('publish', 'unpublish')
+
+    @admin.action(
+        description='Опубликовать выбранные %(verbose_name_plural)s',
+        permissions=('change',)
+    )
+    def publish(self, request, queryset):
+        count = Moderation(queryset).set_published(True)
+        self.message_user(request, f'Опубликовано: {count}')
+
+    @admin.action(
+        description='Снять с публикации выбранные %(verbose_name_plural)s',
+        permissions=('change',)
+    )
+    def unpublish(self, request, queryset):
+        count = Moderation(queryset).set_published(False)
+        self.message_user(request, f'Снято с публикации: {count}')
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Список для таблиц в миллионы строк.
+
+    Строки считаются не дальше ADMIN_COUNT_LIMIT и без второго COUNT(*)
+    по всей таблице, иерархия дат строится запросами по индексу.
+    Удаление выбранных заменено массовым: стандартное загружает каждую
+    строку и показывает их все на странице подтверждения. Здесь она
+    показывает только число удаляемых строк каждой модели, а в журнал
+    админки пишется одна запись на всё удаление.
+    """
+
+    actions = ('delete_selected',)
+    change_list_template = 'admin/blog/change_list.html'
+    delete_selected_confirmation_template = (
+        'admin/blog/delete_counts_confirmation.html'
+    )
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+
+    @admin.action(
+        description='Удалить выбранные %(verbose_name_plural)s',
+        permissions=('delete',)
+    )
+    def delete_selected(self, request, queryset):
+        moderation = Moderation(queryset)
+        perms_lacking = [
+            related.related_model._meta.verbose_name_plural
+            for related in moderation.get_cascaded()
+            if not request.user.has_perm(
+                f'{related.related_model._meta.app_label}.delete_'
+                f'{related.related_model._meta.model_name}'
+            )
+        ]
+        if request.POST.get('post') and not perms_lacking:
+            count = moderation.delete()
+            if count:
+                LogEntry.objects.create(
+                    user_id=request.user.pk,
+                    content_type_id=ContentType.objects.get_for_model(
+                        self.model
+                    ).pk,
+                    object_repr=f'{self.opts.verbose_name_plural}: {count}',
+                    action_flag=DELETION,
+                    change_message=f'Массовое удаление: {count}'
+                )
+            self.message_user(request, f'Удалено: {count}')
+            # None возвращает к списку
+            return None
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request,
+            self.delete_selected_confirmation_template,
+            {
+                **self.admin_site.each_context(request),
+                'title': 'Вы уверены?',
+                'subtitle': None,
+                'objects_name': str(model_ngettext(queryset)),
+                'model_count': [] if perms_lacking else [
+                    (model._meta.verbose_name_plural, count)
+                    for model, count in moderation.count_deleted()
+                ],
+                'perms_lacking': perms_lacking,
+                'opts': self.opts,
+                'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+                'selected': request.POST.getlist(
+                    helpers.ACTION_CHECKBOX_NAME
+                ),
+                'select_across': request.POST.get('select_across', '0'),
+                'media': self.media,
+            }
+        )
+
+
+@admin.register(Category)
+class CategoryAdmin(
+    PrefixAutocompleteMixin, PublishActionsMixin, admin.ModelAdmin
+):
+    search_fields = ('title',)
+    prefix_search_fields = ('title',)
+
+
+@admin.register(Location)
+class LocationAdmin(
+    PrefixAutocompleteMixin, PublishActionsMixin, admin.ModelAdmin
+):
+    search_fields = ('name',)
+    prefix_search_fields = ('name',)
+
+
+@admin.register(Post)
+class PostAdmin(
+    PrefixAutocompleteMixin, PublishActionsMixin, LargeTableAdmin
+):
+    actions = PublishActionsMixin.actions + LargeTableAdmin.actions
+    list_display = (
+        'title',
+        'author',
+        'category',
+        'location',
+        'pub_date',
+        'is_published',
+        'comment_count',
+    )
+    list_select_related = ('author', 'category', 'location')
+    # Местоположений тысячи, авторов — сотни тысяч: их ищут автодополнением
+    list_filter = ('is_published', 'category')
+    date_hierarchy = 'pub_date'
+    search_fields = ('title',)
+    prefix_search_fields = ('title',)
+    autocomplete_fields = ('author', 'category', 'location')
+
+    def get_queryset(self, request):
+        # Подзапрос считается только для строк страницы, а не GROUP BY
+        # по всей таблице
+        return super().get_queryset(request).annotate(
+            comment_count=Coalesce(Subquery(
+                Comment.objects.filter(post=OuterRef('pk'))
+                .order_by()
+                .values('post')
+                .annotate(count=Count('pk'))
+                .values('count')
+            ), 0)
+        )
+
+    @admin.display(description='Комментариев', ordering='comment_count')
+    def comment_count(self, post):
+        return post.comment_count
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    list_display = ('short_text', 'post', 'author', 'created_at')
+    list_select_related = ('post', 'author')
+    date_hierarchy = 'created_at'
+    autocomplete_fields = ('post', 'author')
+
+    @admin.display(description='Текст комментария')
+    def short_text(self, comment):
+        return Truncator(comment.text).chars(MAX_TEXT_LENGTH)
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(PrefixAutocompleteMixin, UserAdmin):
+    prefix_search_fields = ('username',)
@@ -5,3 +5,8 @@ class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     verbose_name = 'Блог'
     name = 'blog'
+
+    def ready(self):
+        from . import lookups, signals  # noqa: F401
+        from .timing import install_template_timing
+        install_template_timing()
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from blog.cache import is_cache_shared
+from blog.metrics import registry
+
+
+USER_CACHE_KEY = 'auth_user:{}'
+
+
+def get_user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(get_user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """Бэкенд, кеширующий пользователя сессии на USER_CACHE_TIMEOUT секунд.
+
+    Только с общим кешем: иначе смена пароля или блокировка сбросила бы
+    копию лишь в одном процессе.
+    """
+
+    def get_user(self, user_id):
+        if not is_cache_shared():
+            return super().get_user(user_id)
+        key = get_user_cache_key(user_id)
+        user = cache.get(key)
+        registry.inc(
+            'blog_cache_requests_total',
+            {'cache': 'user', 'result': 'miss' if user is None else 'hit'}
+        )
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,146 @@
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+
+from blog.metrics import registry
+
+
+PAGE_CACHE_KEY = 'page:{}:{}'
+FEED_CACHE_KEY = 'feed:{}:{}:{}'
+GENERATION_KEY = 'generation:{}'
+LOCK_KEY = 'lock:{}'
+
+# Сколько после истечения срока отдаётся устаревшее значение, пока
+# один процесс его пересчитывает
+STALE_TIMEOUT = 300
+LOCK_TIMEOUT = 10
+LOCK_WAIT_INTERVAL = 0.05
+# Чем больше, тем раньше начинается вероятностный пересчёт
+EARLY_EXPIRATION_BETA = 1.0
+# Бэкенды, записи которых видны только своему процессу
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_cache_shared():
+    """Видят ли все процессы сервера одни и те же записи кеша.
+
+    Без этого нельзя ни сбросить запись во всех процессах, ни пересчитать
+    её в одном: кеши, которые на это опираются, отключаются.
+    """
+    if settings.CACHE_SHARED is not None:
+        return settings.CACHE_SHARED
+    return settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+def get_generation(name):
+    return cache.get_or_set(GENERATION_KEY.format(name), 0, None)
+
+
+def bump_generation(name):
+    key = GENERATION_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def is_expired(expires_at, delta):
+    # XFetch: чем дольше пересчёт, тем раньше до истечения срока
+    # кто-то один начнёт его заново
+    return (
+        time.time() - delta * EARLY_EXPIRATION_BETA
+        * math.log(1 - random.random())
+        >= expires_at
+    )
+
+
+def recompute_and_set(key, recompute, timeout):
+    started = time.time()
+    value = recompute()
+    delta = time.time() - started
+    cache.set(
+        key,
+        (value, time.time() + timeout, delta),
+        timeout + STALE_TIMEOUT
+    )
+    return value
+
+
+def count_cache_request(cache_name, result):
+    registry.inc(
+        'blog_cache_requests_total',
+        {'cache': cache_name, 'result': result}
+    )
+
+
+def get_or_recompute(key, recompute, timeout):
+    """Значение из кеша; пересчитывает его только один процесс.
+
+    Пока идёт пересчёт, остальные получают устаревшее значение,
+    а при пустом кеше ждут его не дольше LOCK_TIMEOUT.
+    """
+    cache_name = key.split(':', 1)[0]
+    if not is_cache_shared():
+        count_cache_request(cache_name, 'bypass')
+        return recompute()
+    entry = cache.get(key)
+    if entry is not None and not is_expired(*entry[1:]):
+        count_cache_request(cache_name, 'hit')
+        return entry[0]
+    lock_key = LOCK_KEY.format(key)
+    if cache.add(lock_key, True, LOCK_TIMEOUT):
+        count_cache_request(cache_name, 'miss')
+        try:
+            return recompute_and_set(key, recompute, timeout)
+        finally:
+            cache.delete(lock_key)
+    if entry is not None:
+        count_cache_request(cache_name, 'stale')
+        return entry[0]
+    count_cache_request(cache_name, 'wait')
+    deadline = time.time() + LOCK_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(LOCK_WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return recompute()
+
+
+def get_page_cache_key(path):
+    return PAGE_CACHE_KEY.format(get_generation('pages'), path)
+
+
+def get_feed_cache_key(path, page):
+    return FEED_CACHE_KEY.format(get_generation('feed'), path, page)
+
+
+def get_cached_page(path):
+    if not is_cache_shared():
+        return None
+    page = cache.get(get_page_cache_key(path))
+    count_cache_request('page', 'miss' if page is None else 'hit')
+    return page
+
+
+def set_cached_page(path, content):
+    if not is_cache_shared():
+        return
+    cache.set(
+        get_page_cache_key(path),
+        content,
+        settings.PAGE_CACHE_TIMEOUT
+    )
+
+
+def invalidate_post_page(post_id):
+    cache.delete(
+        get_page_cache_key(reverse('blog:post_detail', args=[post_id]))
+    )
@@ -0,0 +1,66 @@
+import threading
+from collections import Counter
+
+from django.http import HttpResponse
+
+from blog.metrics import registry
+
+
+class Flight:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+
+
+class RequestCoalescer:
+    """Склеивает одинаковые одновременные запросы внутри процесса.
+
+    Первый запрос (ведущий) выполняет представление, остальные ждут
+    его ответ не дольше timeout секунд и получают копию.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.stats = Counter()
+
+    def run(self, key, get_response, timeout):
+        with self.lock:
+            flight = self.flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self.flights[key] = Flight()
+        if is_leader:
+            return self.lead(key, flight, get_response)
+        if flight.done.wait(timeout) and flight.response is not None:
+            self.count('collapsed')
+            content, status, headers = flight.response
+            return HttpResponse(content, status=status, headers=headers)
+        self.count('timeouts')
+        return get_response()
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+        registry.inc('blog_coalesced_requests_total', {'result': name})
+
+    def lead(self, key, flight, get_response):
+        self.count('leaders')
+        try:
+            response = get_response()
+            if hasattr(response, 'render'):
+                response.render()
+            flight.response = (
+                response.content,
+                response.status_code,
+                dict(response.headers)
+            )
+            return response
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+
+
+coalescer = RequestCoalescer()
@@ -1,6 +1,8 @@
 from django.forms import ModelForm
 
 from .models import Post, Comment, User
+from .reference import references
+from .widgets import AutocompleteSelect
 
 
 class CommentForm(ModelForm):
@@ -19,6 +21,22 @@ class PostForm(ModelForm):
         exclude = (
             'author',
         )
+        widgets = {
+            name: AutocompleteSelect(name) for name in references
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # В HTML только выбранный вариант, взятый из памяти процесса
+        for name, reference in references.items():
+            field = self.fields[name]
+            try:
+                selected = reference.get(int(self[name].value()))
+            except (TypeError, ValueError):
+                selected = None
+            field.choices = [('', field.empty_label)] + (
+                [(selected.pk, str(selected))] if selected else []
+            )
 
 
 class UserChangeInfoForm(ModelForm):
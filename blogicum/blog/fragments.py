@@ -0,0 +1,74 @@
+import re
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core import signing
+from django.template import Context, RequestContext, TemplateDoesNotExist
+from django.template.loader import get_template
+
+
+FRAGMENT_PREFIX = '<!--fragment:'
+FRAGMENT_RE = re.compile(r'<!--fragment:([\w:-]+)-->')
+FRAGMENT_SALT = 'blog.fragments'
+# Переменная контекста: фрагменты выводятся метками, а не сразу
+DEFER_FRAGMENTS = 'defer_fragments'
+# Заголовок ответа с метками; FragmentMiddleware его удаляет. Заголовок,
+# а не атрибут, сохраняется в кеше страниц и при склейке запросов
+FRAGMENTS_HEADER = 'X-Blog-Fragments'
+
+# Скомпилированные фрагменты: '<шаблон>:<строка>' -> nodelist
+FRAGMENT_NODES = {}
+
+
+def get_request_user(request):
+    """Пользователь запроса; без cookie сессии сессия не читается."""
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return AnonymousUser()
+    return request.user
+
+
+def register_fragment(template_name, lineno, nodelist):
+    fragment_id = f'{template_name}:{lineno}'
+    FRAGMENT_NODES[fragment_id] = nodelist
+    return fragment_id
+
+
+def make_fragment_marker(fragment_id, values):
+    # Подпись не даёт подставить в метку чужой шаблон или значения
+    payload = signing.dumps([fragment_id, values], salt=FRAGMENT_SALT)
+    return f'{FRAGMENT_PREFIX}{payload}-->'
+
+
+def render_fragment(fragment_id, values, user, request):
+    # Компиляция шаблона регистрирует его фрагменты: общую копию страницы
+    # мог сохранить другой процесс
+    try:
+        template = get_template(fragment_id.rsplit(':', 1)[0]).template
+    except TemplateDoesNotExist:
+        return ''
+    nodelist = FRAGMENT_NODES.get(fragment_id)
+    if nodelist is None:
+        # Копия страницы сохранена до изменения шаблона
+        return ''
+    if user.is_authenticated:
+        context = RequestContext(request, {**values, 'user': user})
+    else:
+        # Контекст-процессоры читают сессию, анонимам они не нужны
+        context = Context({**values, 'user': user})
+    with context.bind_template(template):
+        return nodelist.render(context)
+
+
+def render_fragments(content, request):
+    user = get_request_user(request)
+
+    def render_match(match):
+        try:
+            fragment_id, values = signing.loads(
+                match[1], salt=FRAGMENT_SALT
+            )
+        except signing.BadSignature:
+            return ''
+        return render_fragment(fragment_id, values, user, request)
+
+    return FRAGMENT_RE.sub(render_match, content)
@@ -0,0 +1,29 @@
+from django.db.models import CharField, Lookup
+from django.db.models.lookups import StartsWith
+
+# Больше любого символа, который может стоять после префикса
+PREFIX_END = '\U0010ffff'
+
+
+@CharField.register_lookup
+class Prefix(Lookup):
+    """field__prefix: значение начинается с данной строки.
+
+    В SQLite startswith сводится к LIKE, который не использует индекс,
+    а сравнение с диапазоном — использует. Диапазон верен только при
+    побайтовом сравнении строк, как у BINARY-сортировки SQLite по
+    умолчанию; в других СУБД порядок зависит от локали, поэтому там
+    это обычный startswith. Регистр учитывается.
+    """
+
+    lookup_name = 'prefix'
+
+    def as_sql(self, compiler, connection):
+        if connection.vendor != 'sqlite':
+            return StartsWith(self.lhs, self.rhs).as_sql(compiler, connection)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} >= {rhs} AND {lhs} < {rhs}', (
+            *lhs_params, *rhs_params,
+            *lhs_params, *[param + PREFIX_END for param in rhs_params]
+        )
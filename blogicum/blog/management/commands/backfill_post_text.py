@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.cache import bump_generation
+from blog.models import TEXT_DERIVED_FIELDS, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет начало текста, HTML и число слов публикаций, '
+        'созданных в обход save(): до миграции, через bulk_create '
+        'или update().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2_000)
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать все публикации, а не только незаполненные.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('id').only('id', 'text')
+        if not options['all']:
+            posts = posts.filter(text_html='')
+        started = time.monotonic()
+        last_id = 0
+        total = 0
+        while True:
+            # Пагинация по id, а не OFFSET: обновлённые строки выпадают
+            # из выборки незаполненных
+            batch = list(
+                posts.filter(id__gt=last_id)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            for post in batch:
+                post.render_text()
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, TEXT_DERIVED_FIELDS)
+            last_id = batch[-1].id
+            total += len(batch)
+            self.stdout.write(f'Обработано {total}')
+        # bulk_update не отправляет сигналы, сбрасываем кеши явно
+        bump_generation('pages')
+        bump_generation('feed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: {total} публикаций за {time.monotonic() - started:.0f} с'
+        ))
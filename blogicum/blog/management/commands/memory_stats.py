@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from blog.memory import TOP_SITES, collect_memory_stats
+
+
+def format_size(size):
+    return f'{size / 1024:.1f} КиБ'
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит пиковый прирост памяти по представлениям, замеренный '
+        'tracemalloc у доли MEMORY_PROFILE_SAMPLE_RATE запросов, и места '
+        'выделения памяти в самом тяжёлом запросе.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sites',
+            type=int,
+            default=5,
+            help=f'Сколько мест выделения вывести, не больше {TOP_SITES}.'
+        )
+
+    def handle(self, *args, **options):
+        views = sorted(
+            collect_memory_stats().items(),
+            key=lambda item: item[1][2],
+            reverse=True
+        )
+        if not views:
+            self.stderr.write(
+                'Замеров нет: задайте MEMORY_PROFILE_SAMPLE_RATE'
+            )
+        for view_name, (count, total, peak, sites) in views:
+            self.stdout.write(
+                f'{view_name}: замеров {count}, '
+                f'средний пик {format_size(total / count)}, '
+                f'наибольший {format_size(peak)}'
+            )
+            for site, size in sites[:options['sites']]:
+                self.stdout.write(f'    {format_size(size):>12}  {site}')
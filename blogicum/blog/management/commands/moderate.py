@@ -0,0 +1,80 @@
+from django.core.exceptions import FieldError, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import ProtectedError, RestrictedError
+
+from blog.moderation import MODERATED_MODELS, Moderation
+
+MODELS = {model._meta.model_name: model for model in MODERATED_MODELS}
+
+
+def parse_filter(value):
+    lookup, separator, argument = value.partition('=')
+    if not separator:
+        raise ValueError(value)
+    return lookup, argument
+
+
+class Command(BaseCommand):
+    help = (
+        'Массово публикует, снимает с публикации или удаляет записи блога '
+        'пачками UPDATE/DELETE без сигналов для каждой строки и один раз '
+        'сбрасывает кеши. Пример: moderate delete comment '
+        '--filter author__username=spammer'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action',
+            choices=('publish', 'unpublish', 'delete')
+        )
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument(
+            '--filter',
+            type=parse_filter,
+            action='append',
+            default=[],
+            help='Условие поиск=значение для QuerySet.filter(); '
+                 'несколько условий объединяются через И.'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Разрешить действие без --filter над всей таблицей.'
+        )
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только посчитать подходящие записи.'
+        )
+
+    def handle(self, *args, **options):
+        if not options['filter'] and not options['all']:
+            raise CommandError('Укажите --filter или --all')
+        model = MODELS[options['model']]
+        if options['action'] != 'delete' and not any(
+            field.name == 'is_published' for field in model._meta.fields
+        ):
+            raise CommandError(
+                f'{model._meta.verbose_name_plural} можно только удалить'
+            )
+        try:
+            queryset = model.objects.filter(**dict(options['filter']))
+            if options['dry_run']:
+                self.stdout.write(f'Подходит записей: {queryset.count()}')
+                return
+            moderation = Moderation(queryset, options['batch_size'])
+            if options['action'] == 'delete':
+                count = moderation.delete()
+            else:
+                count = moderation.set_published(
+                    options['action'] == 'publish'
+                )
+        except (
+            FieldError, ValidationError, ValueError,
+            ProtectedError, RestrictedError
+        ) as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(
+            f'Изменено записей: {count}'
+        ))
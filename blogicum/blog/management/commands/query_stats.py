@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.queries import collect_query_stats
+
+SORT_KEYS = {
+    'total': lambda stats: stats[1],
+    'count': lambda stats: stats[0],
+    'mean': lambda stats: stats[1] / stats[0],
+    'max': lambda stats: stats[2],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит статистику запросов к БД по формам, собранную всеми '
+        'процессами сервера: число выполнений, суммарное, среднее '
+        'и наибольшее время.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--sort',
+            choices=SORT_KEYS,
+            default='total',
+            help='Порядок сортировки, по убыванию.'
+        )
+        parser.add_argument(
+            '--width',
+            type=int,
+            default=120,
+            help='Обрезать формы запросов до стольких символов; 0 — целиком.'
+        )
+
+    def handle(self, *args, **options):
+        shapes = sorted(
+            collect_query_stats().items(),
+            key=lambda item: SORT_KEYS[options['sort']](item[1]),
+            reverse=True
+        )
+        if not shapes:
+            self.stderr.write('Статистика запросов пуста')
+            if not settings.QUERY_STATS_ENABLED:
+                self.stderr.write('Включите сбор: QUERY_STATS_ENABLED = True')
+        else:
+            self.stdout.write(
+                f'{"запросов":>9}{"всего, мс":>12}{"ср., мс":>10}'
+                f'{"макс., мс":>11}  форма'
+            )
+        width = options['width']
+        for shape, (count, total, longest) in shapes[:options['limit']]:
+            if width and len(shape) > width:
+                shape = shape[:width - 1] + '…'
+            self.stdout.write(
+                f'{count:>9}{total * 1000:>12.1f}'
+                f'{total / count * 1000:>10.2f}{longest * 1000:>11.2f}'
+                f'  {shape}'
+            )
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import defaultdict
+from http.client import HTTPException
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.traffic import get_url_pattern_name, percentile, read_request_log
+
+
+class Command(BaseCommand):
+    help = (
+        'Воспроизводит анонимные GET-запросы из журнала на запущенном '
+        'сервере с заданной параллельностью и частотой и выводит '
+        'пропускную способность и задержки по шаблонам URL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=settings.TRAFFIC_LOG_PATH)
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=0,
+            help='Запросов в секунду; 0 — без ограничения.'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10,
+            help='Ограничение на один запрос, в секундах.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            help='Сколько запросов отправить; по умолчанию весь журнал.'
+        )
+
+    def handle(self, *args, **options):
+        paths = self.load_paths(options['log'])
+        total = options['requests'] or len(paths)
+        latencies, errors, duration = self.replay(
+            [paths[index % len(paths)] for index in range(total)],
+            options['base_url'].rstrip('/'),
+            options['concurrency'],
+            options['rate'],
+            options['timeout']
+        )
+        self.stdout.write(
+            f'{total} запросов за {duration:.1f} с, '
+            f'{total / duration:.1f} запросов/с'
+        )
+        self.stdout.write(
+            f'{"шаблон":<24}{"запросов":>9}{"ошибок":>8}'
+            f'{"p50, мс":>10}{"p95, мс":>10}{"p99, мс":>10}'
+        )
+        for name, values in sorted(latencies.items()):
+            values.sort()
+            self.stdout.write(
+                f'{name:<24}{len(values):>9}{errors[name]:>8}'
+                + ''.join(
+                    f'{percentile(values, p) * 1000:>10.1f}'
+                    for p in (50, 95, 99)
+                )
+            )
+
+    def load_paths(self, log):
+        try:
+            records = list(read_request_log(log))
+        except FileNotFoundError:
+            raise CommandError(f'Журнал {log} не найден')
+        paths = [
+            record['path'] for record in records
+            if record.get('method', 'GET') == 'GET'
+            and not record.get('authenticated', False)
+        ]
+        if not paths:
+            raise CommandError('В журнале нет анонимных GET-запросов')
+        return paths
+
+    def replay(self, paths, base_url, concurrency, rate, timeout):
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+        schedule = iter(enumerate(paths))
+        started = time.monotonic()
+
+        def worker():
+            while True:
+                with lock:
+                    index, path = next(schedule, (None, None))
+                if path is None:
+                    return
+                if rate:
+                    time.sleep(
+                        max(started + index / rate - time.monotonic(), 0)
+                    )
+                elapsed, failed = self.fetch(base_url + path, timeout)
+                name = get_url_pattern_name(path)
+                with lock:
+                    latencies[name].append(elapsed)
+                    errors[name] += failed
+
+        threads = [
+            threading.Thread(target=worker) for _ in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return latencies, errors, time.monotonic() - started
+
+    def fetch(self, url, timeout):
+        started = time.monotonic()
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                response.read()
+        except (OSError, HTTPException):
+            # Обрыв соединения или таймаут считается ошибкой запроса,
+            # а не завершает поток
+            return time.monotonic() - started, True
+        return time.monotonic() - started, False
@@ -0,0 +1,242 @@
+import random
+import time
+from argparse import ArgumentTypeError
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.timezone import now
+
+from blog.cache import bump_generation
+from blog.models import Category, Comment, Location, Post, User
+
+WORDS = (
+    'блог пост город утро вечер дорога море горы лес река солнце дождь '
+    'книга кофе друзья поездка музей парк улица история фото заметка '
+    'мысль работа отпуск праздник концерт выставка прогулка вокзал'
+).split()
+N_TEXTS = 1000
+# Показатель закона Ципфа: чем больше, тем сильнее перекос в пользу
+# популярных авторов и публикаций
+ZIPF_EXPONENT = 1.1
+FUTURE_POSTS_SHARE = 0.05
+UNPUBLISHED_POSTS_SHARE = 0.03
+UNPUBLISHED_CATEGORIES_SHARE = 0.1
+UNPUBLISHED_LOCATIONS_SHARE = 0.1
+POSTS_WITHOUT_LOCATION_SHARE = 0.2
+PUB_DATE_SPREAD = timedelta(days=3 * 365)
+
+
+def zipf_cum_weights(n):
+    return list(accumulate(
+        1 / rank ** ZIPF_EXPONENT for rank in range(1, n + 1)
+    ))
+
+
+def make_texts(min_words, max_words):
+    return [
+        ' '.join(random.choices(
+            WORDS,
+            k=random.randint(min_words, max_words)
+        ))
+        for _ in range(N_TEXTS)
+    ]
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise ArgumentTypeError('должно быть не меньше 1')
+    return number
+
+
+@contextmanager
+def deferred_indexes(*models):
+    """Удаляет вторичные индексы таблиц блога на время загрузки.
+
+    Трогает только неуникальные индексы, созданные CREATE INDEX:
+    уникальные индексы и ограничения остаются, поэтому дубликаты
+    отклоняются и во время загрузки. Пока индексы не созданы заново,
+    запросы к таблицам медленные, поэтому команду не стоит запускать
+    на базе под нагрузкой. Поддерживается только SQLite; на других
+    СУБД индексы не трогаются.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    if any(model._meta.app_label != 'blog' for model in models):
+        raise ValueError('Удалять можно только индексы таблиц блога')
+    indexes = []
+    with connection.cursor() as cursor:
+        for model in models:
+            cursor.execute(
+                'SELECT master.name, master.sql '
+                'FROM pragma_index_list(%s) AS info '
+                'JOIN sqlite_master AS master ON master.name = info.name '
+                "WHERE info.origin = 'c' AND NOT info.\"unique\"",
+                [model._meta.db_table]
+            )
+            indexes += cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes:
+                cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу большим объёмом синтетических данных с реалистичным '
+        'перекосом: популярные авторы и публикации, отложенные публикации, '
+        'снятые с публикации категории и местоположения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=positive_int, default=50_000)
+        parser.add_argument('--categories', type=positive_int, default=200)
+        parser.add_argument('--locations', type=positive_int, default=2_000)
+        parser.add_argument('--posts', type=positive_int, default=1_000_000)
+        parser.add_argument('--comments', type=int, default=3_000_000)
+        parser.add_argument('--batch-size', type=positive_int, default=5_000)
+        parser.add_argument(
+            '--prefix',
+            default='seed',
+            help='Префикс имён пользователей и slug категорий.'
+        )
+        parser.add_argument('--seed', type=int, help='Зерно генератора.')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = f'{options["prefix"]}{int(time.time())}'
+        started = time.monotonic()
+        with deferred_indexes(Category, Location, Post, Comment):
+            user_ids = self.create_users(prefix, options['users'])
+            category_ids = self.create_categories(
+                prefix, options['categories']
+            )
+            location_ids = self.create_locations(options['locations'])
+            post_ids = self.create_posts(
+                options['posts'], user_ids, category_ids, location_ids
+            )
+            self.create_comments(options['comments'], post_ids, user_ids)
+            self.stdout.write('Создание индексов...')
+        # bulk_create не отправляет сигналы, сбрасываем кеши явно
+        bump_generation('pages')
+        bump_generation('feed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.monotonic() - started:.0f} с'
+        ))
+
+    def bulk_create(self, model, objects, total, return_ids=True):
+        """Создаёт объекты пачками и возвращает id созданных записей."""
+        last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        started = time.monotonic()
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                self.flush(model, batch)
+                batch = []
+        self.flush(model, batch)
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {total} '
+            f'за {time.monotonic() - started:.1f} с'
+        )
+        if not return_ids:
+            return None
+        return list(
+            model.objects.filter(id__gt=last_id).values_list('id', flat=True)
+        )
+
+    def flush(self, model, batch):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+
+    def create_users(self, prefix, total):
+        password = make_password(None)
+        return self.bulk_create(User, (
+            User(username=f'{prefix}_{n}', password=password)
+            for n in range(total)
+        ), total)
+
+    def create_categories(self, prefix, total):
+        descriptions = make_texts(5, 40)
+        return self.bulk_create(Category, (
+            Category(
+                title=f'Категория {n}',
+                description=random.choice(descriptions),
+                slug=f'{prefix}-{n}',
+                is_published=random.random() >= UNPUBLISHED_CATEGORIES_SHARE
+            )
+            for n in range(total)
+        ), total)
+
+    def create_locations(self, total):
+        return self.bulk_create(Location, (
+            Location(
+                name=f'Место {n}',
+                is_published=random.random() >= UNPUBLISHED_LOCATIONS_SHARE
+            )
+            for n in range(total)
+        ), total)
+
+    def create_posts(self, total, user_ids, category_ids, location_ids):
+        texts = make_texts(30, 600)
+        author_weights = zipf_cum_weights(len(user_ids))
+        category_weights = zipf_cum_weights(len(category_ids))
+        current_time = now()
+
+        def make_post():
+            shift = random.random() * PUB_DATE_SPREAD
+            if random.random() < FUTURE_POSTS_SHARE:
+                pub_date = current_time + shift / 10
+            else:
+                pub_date = current_time - shift
+            post = Post(
+                title=' '.join(random.choices(WORDS, k=3)).capitalize(),
+                text=random.choice(texts),
+                pub_date=pub_date,
+                is_published=random.random() >= UNPUBLISHED_POSTS_SHARE,
+                author_id=random.choices(
+                    user_ids, cum_weights=author_weights
+                )[0],
+                category_id=random.choices(
+                    category_ids, cum_weights=category_weights
+                )[0],
+                location_id=(
+                    None if random.random() < POSTS_WITHOUT_LOCATION_SHARE
+                    else random.choice(location_ids)
+                )
+            )
+            # bulk_create не вызывает save(), где заполняются эти поля
+            post.render_text()
+            return post
+
+        return self.bulk_create(
+            Post, (make_post() for _ in range(total)), total
+        )
+
+    def create_comments(self, total, post_ids, user_ids):
+        texts = make_texts(3, 60)
+        # Перемешиваем, чтобы вирусными оказались не только старые посты
+        post_ids = random.sample(post_ids, len(post_ids))
+        post_weights = zipf_cum_weights(len(post_ids))
+        author_weights = zipf_cum_weights(len(user_ids))
+        self.bulk_create(Comment, (
+            Comment(
+                text=random.choice(texts),
+                post_id=random.choices(post_ids, cum_weights=post_weights)[0],
+                author_id=random.choices(
+                    user_ids, cum_weights=author_weights
+                )[0]
+            )
+            for _ in range(total)
+        ), total, return_ids=False)
@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from http.client import HTTPException
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+
+from blog.cache import is_cache_shared
+from blog.traffic import get_hot_paths, read_request_log
+
+
+def run_with_budget(fetch, paths, workers, budget):
+    """Выполняет fetch(path) в workers потоках не дольше budget секунд.
+
+    Возвращает {путь: (статус, секунды)} для завершённых запросов; ошибка
+    одного запроса записывается вместо статуса. Потоки ThreadPoolExecutor
+    интерпретатор дожидается при выходе, поэтому потоки здесь daemon:
+    по истечении бюджета незавершённые запросы бросаются.
+    """
+    pending = queue.SimpleQueue()
+    for path in paths:
+        pending.put(path)
+    results = {}
+    lock = threading.Lock()
+
+    def work():
+        while True:
+            try:
+                path = pending.get_nowait()
+            except queue.Empty:
+                return
+            started = time.monotonic()
+            try:
+                status = fetch(path)
+            except Exception as error:
+                status = type(error).__name__
+            with lock:
+                results[path] = status, time.monotonic() - started
+
+    threads = [
+        threading.Thread(target=work, daemon=True) for _ in range(workers)
+    ]
+    deadline = time.monotonic() + budget
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+    with lock:
+        return dict(results)
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает кеш самыми посещаемыми страницами из журнала запросов. '
+        'С --base-url страницы запрашиваются у сервера. Без него они '
+        'рендерятся в этом процессе, что прогревает только общий кеш '
+        '(Redis) и страницы SQLite: кеш в памяти процесса пропадёт '
+        'вместе с командой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log',
+            default=settings.TRAFFIC_LOG_PATH,
+            help='Журнал запросов в формате JSONL.'
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=50,
+            help='Сколько самых посещаемых адресов прогреть.'
+        )
+        parser.add_argument(
+            '--budget',
+            type=float,
+            default=30,
+            help='Ограничение по времени, в секундах.'
+        )
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--base-url', help='Например, http://127.0.0.1')
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=10,
+            help='Ограничение на один запрос к серверу, в секундах.'
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Заголовок Host для запросов тестовым клиентом.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            paths = get_hot_paths(
+                read_request_log(options['log']),
+                options['top']
+            )
+        except FileNotFoundError:
+            paths = []
+        if not paths:
+            self.stderr.write('Журнал запросов пуст, прогревается только /')
+            paths = ['/']
+        if options['base_url']:
+            base_url = options['base_url'].rstrip('/')
+
+            def fetch(path):
+                return self.fetch_url(base_url + path, options['timeout'])
+        elif is_cache_shared():
+            def fetch(path):
+                return self.fetch_with_client(path, options['host'])
+        else:
+            raise CommandError(
+                'Кеш в памяти процесса пропадёт вместе с командой: '
+                'укажите --base-url или настройте общий кеш'
+            )
+
+        started = time.monotonic()
+        results = run_with_budget(
+            fetch, paths, options['workers'], options['budget']
+        )
+        for path, (status, elapsed) in results.items():
+            self.stdout.write(f'{status} {elapsed * 1000:8.1f} мс {path}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Прогрето {len(results)} из {len(paths)} адресов '
+            f'за {time.monotonic() - started:.1f} с'
+        ))
+        if len(results) < len(paths):
+            self.stderr.write(
+                f'Не уложились в бюджет: {len(paths) - len(results)} адресов'
+            )
+
+    def fetch_with_client(self, path, host):
+        try:
+            return Client(HTTP_HOST=host).get(path).status_code
+        finally:
+            connections.close_all()
+
+    def fetch_url(self, url, timeout):
+        try:
+            with urlopen(url, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except HTTPError as error:
+            return error.code
+        except (OSError, HTTPException) as error:
+            return type(error).__name__
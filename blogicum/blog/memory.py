@@ -0,0 +1,95 @@
+import random
+import threading
+import tracemalloc
+
+from django.conf import settings
+
+from blog.metrics import ProcessSnapshot, read_snapshots
+
+TOP_SITES = 10
+IGNORED_FILES = (tracemalloc.__file__, '<frozen importlib._bootstrap>')
+
+
+def take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, filename) for filename in IGNORED_FILES
+    ])
+
+
+class MemoryStats(ProcessSnapshot):
+    """Пиковый прирост памяти по представлениям и места выделения.
+
+    Для каждого представления хранятся число замеров, сумма и максимум
+    пика в байтах и места выделения самого тяжёлого запроса.
+    """
+
+    directory_setting = 'MEMORY_STATS_DIR'
+
+    def __init__(self):
+        super().__init__()
+        self.views = {}
+        # tracemalloc глобален, поэтому замеряется один запрос за раз
+        self.tracing = threading.Lock()
+
+    def should_sample(self):
+        return (
+            random.random() < settings.MEMORY_PROFILE_SAMPLE_RATE
+            and self.tracing.acquire(blocking=False)
+        )
+
+    def measure(self, get_response):
+        """Выполняет get_response под tracemalloc.
+
+        Возвращает ответ, пиковый прирост памяти и места выделения.
+        Трассировку, запущенную не здесь, например python -X tracemalloc,
+        не останавливает.
+        """
+        started = not tracemalloc.is_tracing()
+        try:
+            if started:
+                tracemalloc.start()
+            before = take_snapshot()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            response = get_response()
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            sites = [
+                [str(stat.traceback), stat.size_diff]
+                for stat in take_snapshot().compare_to(
+                    before, 'lineno'
+                )[:TOP_SITES]
+            ]
+        finally:
+            if started:
+                tracemalloc.stop()
+            self.tracing.release()
+        return response, peak, sites
+
+    def add(self, view_name, peak, sites):
+        with self.lock:
+            stats = self.views.setdefault(view_name, [0, 0, 0, []])
+            stats[0] += 1
+            stats[1] += peak
+            if peak >= stats[2]:
+                stats[2:] = [peak, sites]
+
+    def snapshot(self):
+        with self.lock:
+            return {view: list(stats) for view, stats in self.views.items()}
+
+
+memory_stats = MemoryStats()
+
+
+def collect_memory_stats():
+    """Статистика всех процессов: {представление: [n, сумма, max, места]}."""
+    memory_stats.flush(force=True)
+    views = {}
+    for snapshot in read_snapshots(settings.MEMORY_STATS_DIR):
+        for view_name, (count, total, peak, sites) in snapshot.items():
+            stats = views.setdefault(view_name, [0, 0, 0, []])
+            stats[0] += count
+            stats[1] += total
+            if peak >= stats[2]:
+                stats[2:] = [peak, sites]
+    return views
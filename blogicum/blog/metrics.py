@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+HELP = {
+    'blog_requests_total': 'Запросы по представлению и статусу.',
+    'blog_request_errors_total': 'Ответы с кодом 5xx.',
+    'blog_request_duration_seconds': 'Время ответа по представлению.',
+    'blog_db_queries_total': 'Запросы к БД по представлению.',
+    'blog_cache_requests_total': 'Обращения к кешам блога по результату.',
+    'blog_coalesced_requests_total': 'Склеенные одинаковые запросы.',
+}
+
+
+def get_labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def read_snapshots(directory):
+    """Снимки всех процессов из каталога; недописанные пропускаются."""
+    for path in Path(directory).glob('*.json'):
+        try:
+            yield json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+
+
+class ProcessSnapshot:
+    """Данные процесса, периодически сбрасываемые в файл <pid>.json.
+
+    Каталог задаётся настройкой с именем directory_setting; каждый
+    процесс пишет свой файл, читатели суммируют их все.
+    """
+
+    directory_setting = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+    def snapshot(self):
+        raise NotImplementedError
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        interval = settings.METRICS_FLUSH_INTERVAL
+        if not force and now - self.last_flush < interval:
+            return
+        self.last_flush = now
+        directory = Path(getattr(settings, self.directory_setting))
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        temporary_path = path.with_suffix('.tmp')
+        temporary_path.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary_path, path)
+
+
+class MetricsRegistry(ProcessSnapshot):
+    """Метрики процесса; /metrics суммирует метрики всех процессов."""
+
+    directory_setting = 'METRICS_DIR'
+
+    def __init__(self):
+        super().__init__()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        with self.lock:
+            self.counters[name, get_labels_key(labels)] += value
+
+    def observe(self, name, labels, value):
+        key = name, get_labels_key(labels)
+        with self.lock:
+            # Счётчики корзин, последней — +Inf, и сумма значений
+            histogram = self.histograms.setdefault(
+                key, [0] * (len(DURATION_BUCKETS) + 2)
+            )
+            histogram[bisect_left(DURATION_BUCKETS, value)] += 1
+            histogram[-1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, labels, list(histogram)]
+                    for (name, labels), histogram in self.histograms.items()
+                ],
+            }
+
+
+registry = MetricsRegistry()
+
+
+def collect():
+    """Сумма метрик всех процессов."""
+    registry.flush(force=True)
+    counters = defaultdict(float)
+    histograms = {}
+    for snapshot in read_snapshots(settings.METRICS_DIR):
+        for name, labels, value in snapshot['counters']:
+            counters[name, tuple(map(tuple, labels))] += value
+        for name, labels, values in snapshot['histograms']:
+            key = name, tuple(map(tuple, labels))
+            if key in histograms:
+                histograms[key] = [
+                    a + b for a, b in zip(histograms[key], values)
+                ]
+            else:
+                histograms[key] = values
+    return counters, histograms
+
+
+def format_labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+                '\n', r'\n'
+            )
+        )
+        for name, value in pairs
+    ) + '}'
+
+
+def write_header(lines, name, metric_type):
+    lines.append(f'# HELP {name} {HELP.get(name, name)}')
+    lines.append(f'# TYPE {name} {metric_type}')
+
+
+def render_prometheus(counters, histograms):
+    lines = []
+    for name in sorted({name for name, _ in counters}):
+        write_header(lines, name, 'counter')
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f'{name}{format_labels(labels)} {value:g}')
+    for name in sorted({name for name, _ in histograms}):
+        write_header(lines, name, 'histogram')
+        for (metric, labels), values in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(DURATION_BUCKETS + ('+Inf',), values):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{format_labels(labels, le=bound)} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{name}_sum{format_labels(labels)} {values[-1]:g}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
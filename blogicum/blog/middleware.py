@@ -0,0 +1,324 @@
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.fragments import (
+    FRAGMENTS_HEADER,
+    get_request_user,
+    render_fragments
+)
+from blog.memory import memory_stats
+from blog.metrics import registry
+from blog.profiling import (
+    StackSampler,
+    is_profiling_requested,
+    save_profile
+)
+from blog.queries import (
+    QueryRecorder,
+    current_sql_tags,
+    log_queries,
+    query_stats,
+    report_violations
+)
+from blog.timing import (
+    RequestTimings,
+    current_timings,
+    is_timing_requested
+)
+from blog.traffic import get_logged_path, is_path_logged, write_request_record
+
+timing_logger = logging.getLogger('blog.timing')
+
+
+class FragmentMiddleware:
+    """Подставляет в общую копию страницы фрагменты текущего пользователя.
+
+    Обрабатываются только HTML-ответы с заголовком FRAGMENTS_HEADER,
+    который ставит SharedPageCacheMixin.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not response.has_header(FRAGMENTS_HEADER):
+            return response
+        del response[FRAGMENTS_HEADER]
+        if (
+            not response.streaming
+            and response.get('Content-Type', '').startswith('text/html')
+        ):
+            response.content = render_fragments(
+                response.content.decode(response.charset),
+                request
+            )
+        return response
+
+
+class TrafficCaptureMiddleware:
+    """Записывает долю TRAFFIC_SAMPLE_RATE запросов в журнал запросов.
+
+    Адреса входа, сброса пароля и админки не записываются.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            random.random() >= settings.TRAFFIC_SAMPLE_RATE
+            or not is_path_logged(request.path)
+        ):
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        match = request.resolver_match
+        # Если CommonMiddleware ответила до AuthenticationMiddleware,
+        # например на недопустимый Host, пользователя у запроса нет
+        authenticated = (
+            getattr(request, 'user', None) is not None
+            and get_request_user(request).is_authenticated
+        )
+        write_request_record(settings.TRAFFIC_LOG_PATH, {
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': get_logged_path(request),
+            'view': match.view_name if match else None,
+            'authenticated': authenticated,
+            'status': response.status_code,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+            'queries': len(recorder),
+        })
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Проверяет бюджет запросов представления и ищет N+1.
+
+    Бюджет задаётся атрибутом query_budget класса представления.
+    Нарушения пишутся в журнал, а при QUERY_BUDGET_RAISE — приводят
+    к исключению.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        request.query_count = len(recorder)
+        violations = recorder.get_violations(
+            getattr(request, 'query_budget', None)
+        )
+        if violations:
+            report_violations(request.path, violations)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        request.query_budget = getattr(view_class, 'query_budget', None)
+
+
+class ServerTimingMiddleware:
+    """Замеряет фазы запроса: middleware, представление, БД и шаблоны.
+
+    Доля SERVER_TIMING_SAMPLE_RATE запросов пишется в журнал.
+    Персонал получает заголовок Server-Timing, запросив его заголовком
+    X-Server-Timing. Замерять ли запрос, решается один раз до начала
+    замеров; остальные запросы проходят без них. Должно стоять первым
+    в MIDDLEWARE, а ViewTimingMiddleware — последним.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sampled = random.random() < settings.SERVER_TIMING_SAMPLE_RATE
+        if not sampled and not is_timing_requested(request):
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(timings):
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        total = time.perf_counter() - started
+        timings.add(
+            'middleware',
+            total - timings.durations.pop('app', 0)
+        )
+        timings.add('total', total)
+        if (
+            is_timing_requested(request)
+            and getattr(request, 'user', None) is not None
+            and get_request_user(request).is_staff
+        ):
+            response['Server-Timing'] = timings.as_header()
+        if sampled:
+            timing_logger.info(
+                'Фазы запроса %s %s',
+                request.method,
+                request.path,
+                extra={'path': request.path, 'timings': timings.as_dict()}
+            )
+        return response
+
+
+class ViewTimingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = current_timings.get()
+        if timings is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        timings.add('app', time.perf_counter() - started)
+        self.stop_view_timer(request, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if current_timings.get() is not None:
+            request.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = current_timings.get()
+        if timings is not None:
+            self.stop_view_timer(request, timings)
+        return response
+
+    def stop_view_timer(self, request, timings):
+        started = getattr(request, 'view_started', None)
+        if started is not None:
+            timings.add('view', time.perf_counter() - started)
+            request.view_started = None
+
+
+class MetricsMiddleware:
+    """Собирает задержки, число запросов к БД и ошибки по представлениям."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        labels = {'view': match.view_name if match else 'unresolved'}
+        registry.observe(
+            'blog_request_duration_seconds',
+            labels,
+            time.perf_counter() - started
+        )
+        registry.inc(
+            'blog_requests_total',
+            {**labels, 'status': response.status_code}
+        )
+        registry.inc(
+            'blog_db_queries_total',
+            labels,
+            getattr(request, 'query_count', 0)
+        )
+        if response.status_code >= 500:
+            registry.inc('blog_request_errors_total', labels)
+        registry.flush()
+        return response
+
+
+class ProfilingMiddleware:
+    """Профилирует запрос персонала по заголовку X-Profile или ?profile.
+
+    Ссылка на сохранённый профиль возвращается в заголовке X-Profile.
+    Должно стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            not is_profiling_requested(request)
+            or not request.user.is_staff
+        ):
+            return self.get_response(request)
+        with StackSampler(settings.PROFILE_SAMPLE_INTERVAL) as sampler:
+            response = self.get_response(request)
+        match = request.resolver_match
+        name = save_profile(
+            match.view_name if match else 'unresolved',
+            sampler
+        )
+        response['X-Profile'] = reverse(
+            'blog:download_profile', args=[name]
+        )
+        return response
+
+
+class SlowQueryMiddleware:
+    """Помечает SQL представлением и маршрутом, ведёт журнал медленных.
+
+    Запросы, выполненные до разрешения URL, остаются без комментария.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            with connection.execute_wrapper(log_queries):
+                response = self.get_response(request)
+        finally:
+            token = getattr(request, 'sql_tags_token', None)
+            if token is not None:
+                current_sql_tags.reset(token)
+        if settings.QUERY_STATS_ENABLED:
+            query_stats.flush()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', view_func)
+        request.sql_tags_token = current_sql_tags.set({
+            'controller': view_class.__name__,
+            'route': request.resolver_match.view_name,
+        })
+
+
+class MemoryProfilingMiddleware:
+    """Замеряет пик памяти доли MEMORY_PROFILE_SAMPLE_RATE запросов.
+
+    Отчёт выводит команда memory_stats.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not memory_stats.should_sample():
+            return self.get_response(request)
+        response, peak, sites = memory_stats.measure(
+            lambda: self.get_response(request)
+        )
+        match = request.resolver_match
+        memory_stats.add(
+            match.view_name if match else 'unresolved',
+            peak,
+            sites
+        )
+        memory_stats.flush()
+        return response
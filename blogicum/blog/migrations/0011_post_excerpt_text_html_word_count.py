@@ -0,0 +1,54 @@
+# Generated by Django 5.1.1 on 2026-10-19 08:53
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr, truncatewords
+from django.utils.text import Truncator
+
+# Копия Post.render_text: исторические модели не имеют методов модели
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 256
+BATCH_SIZE = 1000
+
+
+def render_texts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    batch = []
+    for post in Post.objects.only('text').iterator(chunk_size=BATCH_SIZE):
+        post.excerpt = Truncator(
+            truncatewords(post.text, EXCERPT_WORDS)
+        ).chars(EXCERPT_MAX_LENGTH)
+        post.text_html = linebreaksbr(post.text, autoescape=True)
+        post.word_count = len(post.text.split())
+        batch.append(post)
+        if len(batch) == BATCH_SIZE:
+            Post.objects.bulk_update(
+                batch, ['excerpt', 'text_html', 'word_count']
+            )
+            batch = []
+    Post.objects.bulk_update(batch, ['excerpt', 'text_html', 'word_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_alter_post_managers_remove_comment_is_published'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=256, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число слов'),
+        ),
+        migrations.RunPython(render_texts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_excerpt_text_html_word_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='title',
+            field=models.CharField(db_index=True, max_length=256, verbose_name='Заголовок'),
+        ),
+    ]
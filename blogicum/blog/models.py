@@ -1,11 +1,18 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.template.defaultfilters import linebreaksbr, truncatewords
+from django.utils.text import Truncator
 from django.utils.timezone import now
 
 from .querysets import PostQuerySet
+from .urlbuilder import build_url
 
 MAX_TITLE_LENGTH = 30
 MAX_DESCRIPTION_LENGTH = 40
+EXCERPT_WORDS = 10
+EXCERPT_MAX_LENGTH = 256
+# Поля, вычисляемые из text при сохранении
+TEXT_DERIVED_FIELDS = ('excerpt', 'text_html', 'word_count')
 
 
 User = get_user_model()
@@ -50,6 +57,9 @@ class Category(CreatedAtIsPublishedFields):
             f' | {self.description[:MAX_DESCRIPTION_LENGTH]}'
         )
 
+    def get_absolute_url(self):
+        return build_url('blog:category_posts', self.slug)
+
     class Meta:
         ordering = ('title',)
 
@@ -78,6 +88,7 @@ class Post(CreatedAtIsPublishedFields):
 
     title = models.CharField(
         max_length=256,
+        db_index=True,
         verbose_name='Заголовок'
     )
     text = models.TextField(
@@ -86,6 +97,7 @@ class Post(CreatedAtIsPublishedFields):
     pub_date = models.DateTimeField(
         blank=True,
         default=now,
+        db_index=True,
         verbose_name='Дата и время публикации',
         help_text=(
             'Если установить дату и время в будущем — '
@@ -116,6 +128,22 @@ class Post(CreatedAtIsPublishedFields):
         null=True,
         verbose_name='Категория'
     )
+    excerpt = models.CharField(
+        max_length=EXCERPT_MAX_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
+    word_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число слов'
+    )
 
     class Meta:
         ordering = ('-pub_date',)
@@ -124,10 +152,32 @@ class Post(CreatedAtIsPublishedFields):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
+    def __str__(self):
+        return f'{self.title[:MAX_TITLE_LENGTH]}'
+
+    def get_absolute_url(self):
+        return build_url('blog:post_detail', self.pk)
+
+    def render_text(self):
+        """Заполняет поля, которые шаблоны раньше вычисляли из text."""
+        self.excerpt = Truncator(
+            truncatewords(self.text, EXCERPT_WORDS)
+        ).chars(EXCERPT_MAX_LENGTH)
+        self.text_html = linebreaksbr(self.text, autoescape=True)
+        self.word_count = len(self.text.split())
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None or 'text' in update_fields:
+            self.render_text()
+            if update_fields is not None:
+                update_fields = {*update_fields, *TEXT_DERIVED_FIELDS}
+        super().save(*args, update_fields=update_fields, **kwargs)
+
 
 class Comment(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
+        db_index=True,
         verbose_name='Добавлено'
     )
     text = models.TextField(
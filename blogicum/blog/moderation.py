@@ -0,0 +1,181 @@
+from collections import Counter
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.deletion import Collector
+
+from blog.cache import bump_generation
+from blog.models import Category, Comment, Location, Post
+from blog.purge import (
+    FEED_KEY,
+    get_author_key,
+    get_category_key,
+    get_location_key,
+    get_post_key,
+    purge_keys
+)
+from blog.reference import categories, locations
+
+
+def get_post_purge_keys(pks):
+    # Страница публикации помечена и ключом автора, поэтому ключи
+    # отдельных публикаций не нужны: их тысячи, а авторов — единицы
+    keys = [FEED_KEY]
+    for post in Post.objects.filter(pk__in=pks).select_related(
+        'author', 'category'
+    ).only('author__username', 'category__slug', 'location_id'):
+        keys.append(get_author_key(post.author))
+        if post.category_id is not None:
+            keys.append(get_category_key(post.category))
+        if post.location_id is not None:
+            keys.append(get_location_key(post.location_id))
+    return keys
+
+
+def get_comment_purge_keys(pks):
+    return [
+        get_post_key(post_id) for post_id in Comment.objects.filter(
+            pk__in=pks
+        ).values_list('post_id', flat=True).distinct()
+    ]
+
+
+def get_category_purge_keys(pks):
+    return [FEED_KEY] + [
+        get_category_key(category)
+        for category in Category.objects.filter(pk__in=pks).only('slug')
+    ]
+
+
+def get_location_purge_keys(pks):
+    return [get_location_key(pk) for pk in pks]
+
+
+# Ключи прокси и справочник в памяти процессов для каждой модели
+MODERATED_MODELS = {
+    Post: (get_post_purge_keys, None),
+    Comment: (get_comment_purge_keys, None),
+    Category: (get_category_purge_keys, categories),
+    Location: (get_location_purge_keys, locations),
+}
+
+
+class Moderation:
+    """Массовое изменение строк без сигналов для каждой из них.
+
+    Строки обрабатываются пачками по batch_size: один UPDATE или DELETE
+    с pk__in на пачку. Кеши сбрасываются один раз в конце: поколения,
+    справочники и прокси по ключам, собранным со всех пачек.
+    """
+
+    def __init__(self, queryset, batch_size=None):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.batch_size = batch_size or settings.MODERATION_BATCH_SIZE
+        self.purge_keys = []
+
+    def iter_batches(self, queryset):
+        """Пачки pk по возрастанию; каждую пачку можно менять."""
+        last_pk = 0
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', flat=True)[:self.batch_size]
+            )
+            if not pks:
+                return
+            get_keys, _ = MODERATED_MODELS[self.model]
+            self.purge_keys += get_keys(pks)
+            yield pks
+            last_pk = pks[-1]
+
+    def set_published(self, is_published):
+        """Публикует или снимает с публикации; возвращает число строк."""
+        count = 0
+        for pks in self.iter_batches(
+            self.queryset.exclude(is_published=is_published)
+        ):
+            count += self.model.objects.filter(pk__in=pks).update(
+                is_published=is_published
+            )
+        self.invalidate(count)
+        return count
+
+    def get_cascaded(self):
+        """Связи, строки которых delete() удаляет вместе с данными."""
+        return [
+            related for related in self.model._meta.related_objects
+            if related.on_delete is models.CASCADE
+        ]
+
+    def can_raw_delete(self):
+        """Хватает ли delete() UPDATE и DELETE по связям без Collector.
+
+        Так можно, только если все связи — SET_NULL или CASCADE, а у
+        каскадно удаляемых строк нет своих зависимых.
+        """
+        return all(
+            related.on_delete is models.SET_NULL
+            or related.on_delete is models.CASCADE
+            and not related.related_model._meta.related_objects
+            for related in self.model._meta.related_objects
+        )
+
+    def count_deleted(self):
+        """Сколько строк каждой модели удалит delete(): [(модель, n)]."""
+        if not self.can_raw_delete():
+            collector = Collector(self.queryset.db, origin=self.queryset)
+            collector.collect(self.queryset)
+            counts = Counter({
+                model: len(instances)
+                for model, instances in collector.data.items()
+            })
+            for queryset in collector.fast_deletes:
+                counts[queryset.model] += queryset.count()
+            return list(counts.items())
+        pks = self.queryset.values('pk')
+        return [(self.model, self.queryset.count())] + [
+            (related.related_model, related.related_model.objects.filter(
+                **{f'{related.field.name}__in': pks}
+            ).count())
+            for related in self.get_cascaded()
+        ]
+
+    def delete(self):
+        """Удаляет строки и зависимые от них; возвращает число строк."""
+        count = 0
+        raw_delete = self.can_raw_delete()
+        for pks in self.iter_batches(self.queryset):
+            rows = self.model.objects.filter(pk__in=pks)
+            if not raw_delete:
+                # PROTECT, SET_DEFAULT и вложенные связи соблюдает
+                # Collector, как при обычном удалении
+                _, deleted = rows.delete()
+                count += deleted.get(self.model._meta.label, 0)
+                continue
+            with transaction.atomic():
+                for related in self.model._meta.related_objects:
+                    related_rows = related.related_model.objects.filter(
+                        **{f'{related.field.name}__in': pks}
+                    )
+                    if related.on_delete is models.SET_NULL:
+                        related_rows.update(**{related.field.name: None})
+                    else:
+                        # Остался CASCADE без своих зависимых строк
+                        related_rows._raw_delete(related_rows.db)
+                # _raw_delete пропускает сбор объектов и сигналы,
+                # которые QuerySet.delete() отправил бы для каждой строки
+                count += rows._raw_delete(rows.db)
+        self.invalidate(count)
+        return count
+
+    def invalidate(self, count):
+        if not count:
+            return
+        _, reference = MODERATED_MODELS[self.model]
+        if reference is not None:
+            reference.invalidate()
+        # Вместо сброса страницы каждой публикации — всех разом
+        bump_generation('pages')
+        bump_generation('feed')
+        purge_keys(self.purge_keys)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.utils.functional import cached_property
+
+# Сколько ссылок показывать вокруг текущей страницы и у краёв
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
+
+
+class ElidedPage(Page):
+
+    @property
+    def elided_page_range(self):
+        """Номера страниц для навигации с пропусками Paginator.ELLIPSIS.
+
+        Генератор не строит весь page_range, поэтому число ссылок
+        не зависит от длины ленты.
+        """
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGES_ON_EACH_SIDE,
+            on_ends=PAGES_ON_ENDS
+        )
+
+
+class ElidedPaginator(Paginator):
+
+    def _get_page(self, *args, **kwargs):
+        return ElidedPage(*args, **kwargs)
+
+
+class CappedCountPaginator(Paginator):
+    """Paginator, который считает строки не дальше ADMIN_COUNT_LIMIT.
+
+    COUNT(*) по таблице в миллионы строк занимает секунды; страницы
+    за пределом недоступны, до этих строк добираются фильтрами и поиском.
+    """
+
+    @cached_property
+    def count(self):
+        return self.object_list[:settings.ADMIN_COUNT_LIMIT].count()
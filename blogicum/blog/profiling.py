@@ -0,0 +1,92 @@
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+PROFILE_SUFFIX = '.folded'
+
+
+def is_profiling_requested(request):
+    return PROFILE_HEADER in request.META or PROFILE_PARAM in request.GET
+
+
+def format_stack(frame):
+    """Стек кадра в свёрнутом виде: от корня к листу через «;»."""
+    names = []
+    while frame is not None:
+        names.append(
+            f'{frame.f_globals.get("__name__", "?")}:{frame.f_code.co_name}'
+        )
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """Раз в interval секунд снимает стек потока, создавшего сэмплер.
+
+    Поток представления не замедляется трассировкой: стеки читает
+    отдельный поток через sys._current_frames.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[format_stack(frame)] += 1
+
+    def as_collapsed(self):
+        """Формат collapsed stacks для flamegraph.pl и speedscope."""
+        return ''.join(
+            f'{stack} {count}\n'
+            for stack, count in self.stacks.most_common()
+        )
+
+
+def save_profile(view_name, sampler):
+    """Сохраняет профиль и удаляет старые сверх PROFILE_MAX_FILES."""
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    name = '{}-{}{}'.format(
+        time.time_ns(),
+        view_name.replace(':', '.'),
+        PROFILE_SUFFIX
+    )
+    (directory / name).write_text(sampler.as_collapsed())
+    # Имена начинаются с времени, поэтому сортировка — по возрасту
+    profiles = sorted(directory.glob(f'*{PROFILE_SUFFIX}'))
+    for path in profiles[:-settings.PROFILE_MAX_FILES]:
+        path.unlink(missing_ok=True)
+    return name
+
+
+def get_profile_path(name):
+    """Путь к сохранённому профилю или None для чужих имён."""
+    path = Path(settings.PROFILE_DIR) / name
+    if (
+        Path(name).name != name
+        or not name.endswith(PROFILE_SUFFIX)
+        or not path.is_file()
+    ):
+        return None
+    return path
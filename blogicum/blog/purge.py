@@ -0,0 +1,124 @@
+import logging
+from http.client import HTTPException
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+FEED_KEY = 'feed'
+# Длина заголовка Surrogate-Key одного запроса PURGE; у Varnish
+# по умолчанию весь заголовок не длиннее 8 КиБ
+MAX_SURROGATE_KEY_LENGTH = 4096
+
+
+def get_post_keys(post):
+    keys = [get_post_key(post.pk), get_author_key(post.author)]
+    if post.category_id is not None:
+        keys.append(get_category_key(post.category))
+    if post.location_id is not None:
+        keys.append(get_location_key(post.location_id))
+    return keys
+
+
+def get_post_key(post_id):
+    return f'post:{post_id}'
+
+
+def get_location_key(location_id):
+    return f'location:{location_id}'
+
+
+def get_author_key(user):
+    return f'author:{user.username}'
+
+
+def get_category_key(category):
+    return f'category:{category.slug}'
+
+
+def split_keys(keys, max_length):
+    """Пачки ключей, каждая через пробел не длиннее max_length.
+
+    Ключ длиннее max_length отправляется отдельной пачкой.
+    """
+    batch, length = [], 0
+    for key in keys:
+        if batch and length + 1 + len(key) > max_length:
+            yield batch
+            batch, length = [], 0
+        length += len(key) + (1 if batch else 0)
+        batch.append(key)
+    if batch:
+        yield batch
+
+
+def set_surrogate_keys(response, keys):
+    keys = list(dict.fromkeys(keys))
+    response['Surrogate-Key'] = ' '.join(keys)
+    response['Cache-Tag'] = ','.join(keys)
+    return response
+
+
+class BasePurger:
+
+    def __init__(self, **options):
+        self.options = options
+
+    def purge(self, keys):
+        raise NotImplementedError
+
+
+class NullPurger(BasePurger):
+
+    def purge(self, keys):
+        pass
+
+
+class HttpPurger(BasePurger):
+    """Отправляет прокси запросы PURGE с заголовком Surrogate-Key.
+
+    Ключи делятся на запросы с заголовком не длиннее MAX_HEADER_LENGTH
+    из OPTIONS, по умолчанию MAX_SURROGATE_KEY_LENGTH.
+    """
+
+    def purge(self, keys):
+        for batch in split_keys(keys, self.options.get(
+            'MAX_HEADER_LENGTH', MAX_SURROGATE_KEY_LENGTH
+        )):
+            self.send(batch)
+
+    def send(self, keys):
+        request = Request(
+            self.options['URL'],
+            method='PURGE',
+            headers={'Surrogate-Key': ' '.join(keys)}
+        )
+        try:
+            urlopen(request, timeout=self.options.get('TIMEOUT', 2)).close()
+        except (OSError, HTTPException) as error:
+            # Сбой прокси не должен ронять запрос, в конце которого
+            # выполняется очистка
+            logger.warning('Не удалось очистить кеш %s: %s', keys, error)
+
+
+class LocMemPurger(BasePurger):
+    """Заменитель HttpPurger для тестов: запоминает очищенные ключи."""
+
+    purged = []
+
+    def purge(self, keys):
+        self.purged.append(list(keys))
+
+
+def get_purger():
+    config = settings.CACHE_PURGER
+    return import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+
+
+def purge_keys(keys):
+    keys = list(dict.fromkeys(keys))
+    transaction.on_commit(lambda: get_purger().purge(keys))
@@ -0,0 +1,190 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import connection
+
+from blog.metrics import ProcessSnapshot, read_snapshots
+
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger('blog.slow_queries')
+
+IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+LITERAL_RE = re.compile(r"'[^']*'|\b\d+\b")
+SQL_COMMENT_RE = re.compile(r'\s*/\*.*?\*/\s*$', re.DOTALL)
+
+# Теги текущего запроса для комментариев к SQL
+current_sql_tags = ContextVar('current_sql_tags', default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def normalize_sql(sql):
+    """Форма запроса: без литералов и с любой длиной списка IN."""
+    sql = SQL_COMMENT_RE.sub('', sql)
+    return IN_LIST_RE.sub('IN (...)', LITERAL_RE.sub('?', sql))
+
+
+def make_sql_comment(tags):
+    """Комментарий в формате sqlcommenter: /*key='value',...*/."""
+    return '/*{}*/'.format(','.join(
+        f"{key}='{quote(str(value), safe=':.')}'"
+        for key, value in sorted(tags.items())
+    ))
+
+
+class QueryStats(ProcessSnapshot):
+    """Число выполнений, суммарное и наибольшее время по формам запросов."""
+
+    directory_setting = 'QUERY_STATS_DIR'
+
+    def __init__(self):
+        super().__init__()
+        self.shapes = {}
+
+    def add(self, sql, duration):
+        shape = normalize_sql(sql)
+        with self.lock:
+            stats = self.shapes.setdefault(shape, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+
+    def snapshot(self):
+        with self.lock:
+            return {shape: list(stats) for shape, stats in self.shapes.items()}
+
+
+query_stats = QueryStats()
+
+
+def collect_query_stats():
+    """Статистика форм запросов всех процессов: {форма: [n, сумма, max]}."""
+    if settings.QUERY_STATS_ENABLED:
+        query_stats.flush(force=True)
+    shapes = {}
+    for snapshot in read_snapshots(settings.QUERY_STATS_DIR):
+        for shape, (count, total, longest) in snapshot.items():
+            stats = shapes.setdefault(shape, [0, 0.0, 0.0])
+            stats[0] += count
+            stats[1] += total
+            stats[2] = max(stats[2], longest)
+    return shapes
+
+
+def explain(connection, sql, params):
+    # Курсор без обёрток, чтобы EXPLAIN не попадал в журнал и статистику
+    explain_prefix = (
+        'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    )
+    with connection.cursor() as cursor:
+        cursor.cursor.execute(f'{explain_prefix} {sql}', params)
+        return '; '.join(
+            ' '.join(map(str, row)) for row in cursor.cursor.fetchall()
+        )
+
+
+def log_queries(execute, sql, params, many, context):
+    """Обёртка выполнения запросов: комментарий, статистика, журнал.
+
+    Запросы дольше SLOW_QUERY_THRESHOLD миллисекунд пишутся в журнал
+    blog.slow_queries вместе с параметрами и планом выполнения.
+    """
+    tags = current_sql_tags.get()
+    if tags:
+        comment = make_sql_comment(tags)
+        if params is not None:
+            comment = comment.replace('%', '%%')
+        sql = f'{sql} {comment}'
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        if settings.QUERY_STATS_ENABLED:
+            query_stats.add(sql, duration)
+        if (
+            duration * 1000 >= settings.SLOW_QUERY_THRESHOLD
+            and not many
+            and sql.lstrip().upper().startswith('SELECT')
+        ):
+            log_slow_query(context['connection'], sql, params, duration)
+
+
+def log_slow_query(connection, sql, params, duration):
+    try:
+        plan = explain(connection, sql, params)
+    except Exception as error:
+        plan = f'не получен: {error}'
+    slow_query_logger.warning(
+        'Медленный запрос, %.1f мс: %s; параметры: %r; план: %s',
+        duration * 1000,
+        sql,
+        params,
+        plan,
+        extra={
+            'duration_ms': round(duration * 1000, 2),
+            'shape': normalize_sql(sql),
+        }
+    )
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.statements)
+
+    def find_repeated(self, threshold):
+        """Формы запросов, повторённые не меньше threshold раз (N+1)."""
+        shapes = Counter(normalize_sql(sql) for sql in self.statements)
+        return {
+            shape: count for shape, count in shapes.items()
+            if count >= threshold
+        }
+
+    def get_violations(self, budget):
+        violations = []
+        if budget is not None and len(self) > budget:
+            violations.append(
+                f'{len(self)} запросов при бюджете {budget}'
+            )
+        for shape, count in self.find_repeated(
+            settings.QUERY_REPEAT_THRESHOLD
+        ).items():
+            violations.append(f'N+1: {count} раз {shape}')
+        return violations
+
+
+def report_violations(path, violations):
+    message = f'{path}: ' + '; '.join(violations)
+    if settings.QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+@contextmanager
+def query_budget(budget=None):
+    """Проверка бюджета запросов и N+1 для тестов.
+
+    Использование: with query_budget(5): client.get(url)
+    """
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        yield recorder
+    violations = recorder.get_violations(budget)
+    assert not violations, '; '.join(violations)
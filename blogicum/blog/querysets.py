@@ -1,6 +1,69 @@
+from contextlib import contextmanager
+
 from django.db import models
+from django.db.models.query import ModelIterable
+from django.db.models.query_utils import DeferredAttribute
 from django.utils.timezone import now
 
+# Поля, которые выводит includes/post_card.html и нужны для ключей кеша;
+# категория и местоположение берутся из blog.reference
+FEED_FIELDS = (
+    'title',
+    'excerpt',
+    'pub_date',
+    'image',
+    'is_published',
+    'category',
+    'location',
+    'author__username',
+)
+
+
+class DeferredFieldAccessed(Exception):
+    pass
+
+
+@contextmanager
+def strict_deferred_fields():
+    """Ленивая загрузка поля внутри блока — исключение. Для тестов.
+
+    Так шаблон, которому не хватает полей проекции only(), падает
+    в тестах, а не делает по запросу на объект. Подменяет метод Django
+    на время блока, поэтому в работающем сервере не используется.
+
+    Использование: with strict_deferred_fields(): client.get(url)
+    """
+    get = DeferredAttribute.__get__
+
+    def guarded_get(self, instance, cls=None):
+        if (
+            instance is not None
+            and self.field.attname not in instance.__dict__
+        ):
+            raise DeferredFieldAccessed(
+                f'Обращение к незагруженному полю '
+                f'{type(instance).__name__}.{self.field.attname}'
+            )
+        return get(self, instance, cls)
+
+    DeferredAttribute.__get__ = guarded_get
+    try:
+        yield
+    finally:
+        DeferredAttribute.__get__ = get
+
+
+class ReferenceIterable(ModelIterable):
+    """Подставляет категории и местоположения из памяти процесса."""
+
+    def __iter__(self):
+        from blog.reference import categories, locations
+
+        for post in super().__iter__():
+            post.category = categories.get(post.category_id)
+            post.location = locations.get(post.location_id)
+            yield post
+
 
 class PostQuerySet(models.QuerySet):
     def join_related_all(self):
@@ -10,6 +73,17 @@ class PostQuerySet(models.QuerySet):
             'location'
         )
 
+    def for_feed(self):
+        """Только поля карточки ленты, без текста и лишних полей связей."""
+        return self.select_related('author').only(
+            'author', *FEED_FIELDS
+        ).with_references()
+
+    def with_references(self):
+        queryset = self._chain()
+        queryset._iterable_class = ReferenceIterable
+        return queryset
+
     def filter_valid(self, *, access_to_hidden=False):
         if access_to_hidden:
             return self
@@ -0,0 +1,105 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.apps import apps
+from django.conf import settings
+
+from blog.cache import (
+    bump_generation,
+    count_cache_request,
+    get_generation,
+    is_cache_shared
+)
+
+
+class ReferenceCache:
+    """Копия небольшой таблицы в памяти процесса.
+
+    Копия помечена поколением из общего кеша: изменение в любом
+    процессе увеличивает его, и остальные перечитывают таблицу, проверив
+    поколение не позже чем через REFERENCE_CHECK_INTERVAL секунд. Без
+    общего кеша таблица перечитывается каждые REFERENCE_CHECK_INTERVAL.
+    """
+
+    def __init__(self, model_label):
+        self.model_label = model_label
+        self.generation_name = f'reference:{model_label}'
+        self.lock = threading.Lock()
+        self.objects = None
+        self.index = ()
+        self.generation = None
+        self.checked_at = 0
+
+    def get_objects(self):
+        """Объекты таблицы по pk в порядке Meta.ordering модели."""
+        now = time.monotonic()
+        if (
+            self.objects is not None
+            and now - self.checked_at < settings.REFERENCE_CHECK_INTERVAL
+        ):
+            return self.objects
+        if is_cache_shared():
+            generation = get_generation(self.generation_name)
+        else:
+            # Поколение в кеше процесса не увидит изменений из других
+            # процессов: копия просто перечитывается раз в интервал
+            generation = now
+        with self.lock:
+            if self.objects is None or generation != self.generation:
+                count_cache_request('reference', 'miss')
+                self.objects = {
+                    obj.pk: obj
+                    for obj in apps.get_model(self.model_label).objects.all()
+                }
+                self.index = sorted(
+                    (str(obj).casefold(), pk)
+                    for pk, obj in self.objects.items()
+                )
+                self.generation = generation
+            self.checked_at = now
+            return self.objects
+
+    def get(self, pk):
+        if pk is None:
+            return None
+        obj = self.get_objects().get(pk)
+        if obj is None:
+            # Запись создана в обход сигналов, например bulk_create
+            self.reset()
+            obj = self.get_objects().get(pk)
+        return obj
+
+    def search(self, term, limit):
+        """Объекты, строковое представление которых начинается с term.
+
+        Без учёта регистра, по возрастанию представления.
+        """
+        objects = self.get_objects()
+        index = self.index
+        term = term.casefold()
+        found = []
+        position = bisect_left(index, (term,))
+        for label, pk in index[position:position + limit]:
+            if not label.startswith(term):
+                break
+            if pk in objects:
+                found.append(objects[pk])
+        return found
+
+    def reset(self):
+        with self.lock:
+            self.objects = None
+
+    def invalidate(self):
+        bump_generation(self.generation_name)
+        self.reset()
+
+
+categories = ReferenceCache('blog.Category')
+locations = ReferenceCache('blog.Location')
+
+references = {
+    'category': categories,
+    'location': locations,
+}
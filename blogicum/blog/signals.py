@@ -0,0 +1,109 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from blog.backends import invalidate_cached_user
+from blog.cache import bump_generation, invalidate_post_page
+from blog.models import Category, Comment, Location, Post, User
+from blog.purge import (
+    FEED_KEY,
+    get_author_key,
+    get_category_key,
+    get_location_key,
+    get_post_key,
+    get_post_keys,
+    purge_keys
+)
+from blog.reference import categories, locations
+
+# Ключи, которыми были помечены страницы до сохранения: при смене
+# категории, имени или slug очищаются и старые страницы
+OLD_KEYS_ATTRIBUTE = '_old_purge_keys'
+
+
+def remember_old_keys(instance, update_fields, fields, get_keys, queryset):
+    """Запоминает ключи сохранённой версии, если меняются их поля."""
+    if instance.pk is None or (
+        update_fields is not None and not set(fields) & set(update_fields)
+    ):
+        return
+    old = queryset.filter(pk=instance.pk).first()
+    if old is not None:
+        setattr(instance, OLD_KEYS_ATTRIBUTE, get_keys(old))
+
+
+def pop_old_keys(instance):
+    return instance.__dict__.pop(OLD_KEYS_ATTRIBUTE, [])
+
+
+@receiver(pre_save, sender=User)
+def remember_user_keys(sender, instance, update_fields=None, **kwargs):
+    remember_old_keys(
+        instance, update_fields, ('username',),
+        lambda user: [get_author_key(user)],
+        User.objects.only('username')
+    )
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    invalidate_cached_user(instance.pk)
+    if update_fields is None or 'username' in update_fields:
+        # Имя автора и ссылка на профиль есть на страницах его публикаций
+        bump_generation('pages')
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        bump_generation('feed')
+        purge_keys([get_author_key(instance), *pop_old_keys(instance)])
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_keys(sender, instance, update_fields=None, **kwargs):
+    remember_old_keys(
+        instance, update_fields, ('author', 'category', 'location'),
+        get_post_keys,
+        Post.objects.select_related('author', 'category').only(
+            'author__username', 'category__slug', 'location_id'
+        )
+    )
+
+
+@receiver((post_save, post_delete), sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    invalidate_post_page(instance.pk)
+    bump_generation('feed')
+    purge_keys([
+        FEED_KEY, *get_post_keys(instance), *pop_old_keys(instance)
+    ])
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    invalidate_post_page(instance.post_id)
+    bump_generation('feed')
+    purge_keys([get_post_key(instance.post_id)])
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_keys(sender, instance, update_fields=None, **kwargs):
+    remember_old_keys(
+        instance, update_fields, ('slug',),
+        lambda category: [get_category_key(category)],
+        Category.objects.only('slug')
+    )
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_category(sender, instance, **kwargs):
+    categories.invalidate()
+    bump_generation('pages')
+    bump_generation('feed')
+    purge_keys([
+        FEED_KEY, get_category_key(instance), *pop_old_keys(instance)
+    ])
+
+
+@receiver((post_save, post_delete), sender=Location)
+def invalidate_location(sender, instance, **kwargs):
+    locations.invalidate()
+    bump_generation('pages')
+    bump_generation('feed')
+    purge_keys([get_location_key(instance.pk)])
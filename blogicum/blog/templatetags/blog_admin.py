@@ -0,0 +1,97 @@
+import copy
+from datetime import timedelta
+
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.db.models import Exists, Max, Min
+from django.utils import timezone
+
+# Больше периодов — столбцов EXISTS — в один запрос не отправляется
+MAX_INDEXED_PERIODS = 100
+
+register = template.Library()
+
+
+def truncate(value, kind):
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if kind == 'day':
+        return value
+    value = value.replace(day=1)
+    return value if kind == 'month' else value.replace(month=1)
+
+
+def get_next_period(start, kind):
+    if kind == 'day':
+        return start + timedelta(days=1)
+    if kind == 'year' or start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+class IndexedDates:
+    """Выборка для иерархии дат, где datetimes() не читает всю выборку.
+
+    Вместо SELECT DISTINCT по усечённой дате, который перебирает все
+    строки, каждый период между первой и последней датой проверяется
+    подзапросом EXISTS по диапазону — его обслуживает индекс поля.
+    Все подзапросы отправляются одним запросом. Первую и последнюю дату
+    берёт из агрегата, который date_hierarchy уже запросил. Если
+    периодов больше MAX_INDEXED_PERIODS, например из-за даты в далёком
+    будущем, используется обычный datetimes().
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self.bounds = None
+
+    def aggregate(self, *args, **kwargs):
+        result = self.queryset.aggregate(*args, **kwargs)
+        if not args and kwargs.keys() == {'first', 'last'}:
+            self.bounds = result
+        return result
+
+    def datetimes(self, field_name, kind):
+        bounds = self.bounds or self.queryset.aggregate(
+            first=Min(field_name), last=Max(field_name)
+        )
+        if bounds['first'] is None:
+            return []
+        periods = {}
+        start = truncate(timezone.localtime(bounds['first']), kind)
+        while start <= bounds['last']:
+            if len(periods) == MAX_INDEXED_PERIODS:
+                return self.queryset.datetimes(field_name, kind)
+            end = get_next_period(start, kind)
+            periods[f'period_{len(periods)}'] = start, Exists(
+                self.queryset.filter(**{
+                    f'{field_name}__gte': start,
+                    f'{field_name}__lt': end,
+                })
+            )
+            start = end
+        found = self.queryset.model._default_manager.order_by().annotate(
+            **{name: exists for name, (_, exists) in periods.items()}
+        ).values_list(*periods)[0]
+        return [
+            start for (start, _), exists in zip(periods.values(), found)
+            if exists
+        ]
+
+
+def indexed_date_hierarchy(cl):
+    cl = copy.copy(cl)
+    cl.queryset = IndexedDates(cl.queryset)
+    return date_hierarchy(cl)
+
+
+@register.tag(name='indexed_date_hierarchy')
+def indexed_date_hierarchy_tag(parser, token):
+    """{% date_hierarchy %} для полей DateTimeField с индексом."""
+    return InclusionAdminNode(
+        parser,
+        token,
+        func=indexed_date_hierarchy,
+        template_name='date_hierarchy.html',
+        takes_context=False,
+    )
@@ -0,0 +1,44 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+from django_bootstrap5.forms import render_form
+
+from blog.cache import count_cache_request
+
+FORM_CACHE_KEY = 'form:{}.{}:{}:{}:{}'
+
+register = template.Library()
+
+
+@register.simple_tag
+def bootstrap_form_cached(form):
+    """{% bootstrap_form %}, кеширующий HTML незаполненных форм.
+
+    Ключ — класс формы, prefix и auto_id, от которых зависят имена
+    и id полей, и get_cache_version(), если он есть, для форм, HTML
+    которых зависит от данных. Формы с initial не кешируются: значения
+    попали бы в HTML. CSRF-токен в кеш не попадает: {% csrf_token %}
+    стоит в шаблоне вне формы.
+    """
+    instance = getattr(form, 'instance', None)
+    if (
+        form.is_bound
+        or form.initial
+        or getattr(instance, 'pk', None) is not None
+    ):
+        return render_form(form)
+    get_cache_version = getattr(form, 'get_cache_version', None)
+    key = FORM_CACHE_KEY.format(
+        type(form).__module__,
+        type(form).__qualname__,
+        form.prefix or '',
+        form.auto_id,
+        get_cache_version() if get_cache_version else ''
+    )
+    html = cache.get(key)
+    count_cache_request('form', 'miss' if html is None else 'hit')
+    if html is None:
+        html = render_form(form)
+        cache.set(key, html, settings.FORM_CACHE_TIMEOUT)
+    return mark_safe(html)
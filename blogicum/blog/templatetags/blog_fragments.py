@@ -0,0 +1,60 @@
+from django import template
+
+from blog.forms import CommentForm
+from blog.fragments import (
+    DEFER_FRAGMENTS,
+    make_fragment_marker,
+    register_fragment
+)
+
+register = template.Library()
+
+
+class UserFragmentNode(template.Node):
+
+    def __init__(self, fragment_id, variables, nodelist):
+        self.fragment_id = fragment_id
+        self.variables = variables
+        self.nodelist = nodelist
+
+    def render(self, context):
+        if not context.get(DEFER_FRAGMENTS):
+            # Страница не попадает в общий кеш: пользователь уже известен
+            return self.nodelist.render(context)
+        values = {}
+        for path, variable in self.variables:
+            *parents, name = path.split('.')
+            target = values
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[name] = variable.resolve(context)
+        return make_fragment_marker(self.fragment_id, values)
+
+
+@register.tag
+def userfragment(parser, token):
+    """Часть страницы, зависящая от пользователя.
+
+    Использование: {% userfragment post.id post.author_id %}...
+    {% enduserfragment %}. Внутри блока доступны только user
+    и перечисленные значения. На страницах SharedPageCacheMixin блок
+    выводится меткой, которую заменяет FragmentMiddleware.
+    """
+    paths = token.split_contents()[1:]
+    nodelist = parser.parse(('enduserfragment',))
+    parser.delete_first_token()
+    fragment_id = register_fragment(
+        parser.origin.template_name,
+        token.lineno,
+        nodelist
+    )
+    return UserFragmentNode(
+        fragment_id,
+        [(path, parser.compile_filter(path)) for path in paths],
+        nodelist
+    )
+
+
+@register.simple_tag
+def comment_form():
+    return CommentForm()
@@ -0,0 +1,11 @@
+from django import template
+
+from blog.urlbuilder import build_url
+
+register = template.Library()
+
+
+@register.filter
+def profile_url(username):
+    """Адрес профиля: {{ post.author.username|profile_url }}."""
+    return build_url('blog:profile', username)
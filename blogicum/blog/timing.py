@@ -0,0 +1,85 @@
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.template.base import Template
+
+TIMING_HEADER = 'HTTP_X_SERVER_TIMING'
+TIMING_MIDDLEWARE = 'blog.middleware.ServerTimingMiddleware'
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    """Время фаз одного запроса, в секундах."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = Counter()
+
+    def add(self, phase, duration):
+        self.durations[phase] += duration
+        self.counts[phase] += 1
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add('db', time.perf_counter() - started)
+
+    def as_dict(self):
+        return {
+            phase: {
+                'ms': round(duration * 1000, 2),
+                'count': self.counts[phase]
+            }
+            for phase, duration in self.durations.items()
+        }
+
+    def as_header(self):
+        metrics = []
+        for index, (phase, duration) in enumerate(self.durations.items()):
+            name, _, template_name = phase.partition(':')
+            if template_name:
+                name = f'tpl{index};desc="{template_name}"'
+            metrics.append(f'{name};dur={duration * 1000:.1f}')
+        return ', '.join(metrics)
+
+
+def is_timing_requested(request):
+    return TIMING_HEADER in request.META
+
+
+def timed_render(render):
+
+    @wraps(render)
+    def wrapper(self, context):
+        timings = current_timings.get()
+        if timings is None:
+            return render(self, context)
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            timings.add(
+                f'tpl:{self.origin.template_name}',
+                time.perf_counter() - started
+            )
+
+    wrapper.timed = True
+    return wrapper
+
+
+def install_template_timing():
+    """Замеряет шаблоны, только если подключён ServerTimingMiddleware.
+
+    Вне замеряемого запроса обёртка сразу вызывает исходный render.
+    """
+    if (
+        TIMING_MIDDLEWARE in settings.MIDDLEWARE
+        and not getattr(Template.render, 'timed', False)
+    ):
+        Template.render = timed_render(Template.render)
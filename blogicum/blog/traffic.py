@@ -0,0 +1,72 @@
+import json
+import math
+import threading
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+write_lock = threading.Lock()
+REDACTED = '-'
+
+
+def is_path_logged(path):
+    return not path.startswith(tuple(settings.TRAFFIC_EXCLUDED_PATHS))
+
+
+def get_logged_path(request):
+    """Путь для журнала; значения параметров, кроме TRAFFIC_KEPT_PARAMS,
+    скрыты: в них бывают токены и личные данные.
+    """
+    if not request.GET:
+        return request.path
+    return request.path + '?' + urlencode([
+        (name, value if name in settings.TRAFFIC_KEPT_PARAMS else REDACTED)
+        for name, values in request.GET.lists()
+        for value in values
+    ])
+
+
+def write_request_record(path, record):
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    with write_lock, open(path, 'a', encoding='utf-8') as log:
+        log.write(line)
+
+
+def read_request_log(path):
+    """Записи журнала запросов; строки без пути запроса пропускаются."""
+    with open(path, encoding='utf-8') as log:
+        for line in log:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 'path' in record:
+                yield record
+
+
+def get_hot_paths(records, limit):
+    """Самые частые успешные анонимные GET-запросы."""
+    hits = Counter(
+        record['path'] for record in records
+        if record.get('method', 'GET') == 'GET'
+        and record.get('status', 200) == 200
+        and not record.get('authenticated', False)
+    )
+    return [path for path, _ in hits.most_common(limit)]
+
+
+def get_url_pattern_name(path):
+    try:
+        return resolve(path.split('?', 1)[0]).view_name
+    except Resolver404:
+        return 'unresolved'
+
+
+def percentile(sorted_values, percent):
+    """Процентиль методом ближайшего ранга."""
+    if not sorted_values:
+        return 0
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
@@ -0,0 +1,34 @@
+from functools import cache
+from urllib.parse import quote
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, reverse
+
+# Подставляется вместо аргумента; подходит под конвертеры int, slug и str
+PLACEHOLDER = '987654321'
+# Символы, которые reverse() оставляет в аргументах без кодирования
+SAFE_CHARS = "/~:@!$&'()*+,;="
+
+
+@cache
+def get_url_parts(name, script_prefix):
+    prefix, suffix = reverse(name, args=[PLACEHOLDER]).split(PLACEHOLDER)
+    return prefix, suffix
+
+
+def build_url(name, arg):
+    """Быстрая замена reverse(name, args=[arg]) для маршрутов с одним
+    аргументом.
+
+    Маршрут разрешается один раз, дальше адрес собирается склейкой
+    строк. Аргумент не проверяется конвертером маршрута.
+    """
+    prefix, suffix = get_url_parts(name, get_script_prefix())
+    return prefix + quote(str(arg), safe=SAFE_CHARS) + suffix
+
+
+@receiver(setting_changed)
+def clear_url_parts(*, setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        get_url_parts.cache_clear()
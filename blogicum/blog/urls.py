@@ -56,6 +56,21 @@ urlpatterns = [
         views.CategoryView.as_view(),
         name='category_posts'
     ),
+    path(
+        'autocomplete/<str:source>/',
+        views.AutocompleteView.as_view(),
+        name='autocomplete'
+    ),
+    path(
+        'profiling/<str:name>',
+        views.ProfileDownloadView.as_view(),
+        name='download_profile'
+    ),
+    path(
+        'metrics',
+        views.MetricsView.as_view(),
+        name='metrics'
+    ),
     path(
         '',
         views.IndexView.as_view(),
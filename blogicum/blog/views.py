@@ -1,5 +1,14 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseForbidden,
+    JsonResponse
+)
 from django.shortcuts import get_object_or_404, redirect
+from django.views import View
 from django.views.generic import (
     ListView,
     CreateView,
@@ -9,17 +18,149 @@ from django.views.generic import (
 )
 from django.urls import reverse, reverse_lazy
 
+from blog.cache import (
+    get_cached_page,
+    get_feed_cache_key,
+    get_or_recompute,
+    set_cached_page
+)
+from blog.coalescing import coalescer
 from blog.forms import (
     PostForm,
     CommentForm,
     UserChangeInfoForm
 )
+from blog.fragments import (
+    DEFER_FRAGMENTS,
+    FRAGMENTS_HEADER,
+    get_request_user
+)
+from blog.metrics import collect, render_prometheus
 from blog.models import Post, Comment, Category, User
+from blog.pagination import ElidedPaginator
+from blog.profiling import get_profile_path
+from blog.reference import references
+from blog.purge import (
+    FEED_KEY,
+    get_author_key,
+    get_category_key,
+    get_post_keys,
+    set_surrogate_keys
+)
 
 
 MAX_POSTS_PER_PAGE = 10
 
 
+class SurrogateKeysMixin:
+    """Помечает ответ ключами объектов, по которым прокси очищает кеш."""
+
+    def get_surrogate_keys(self, context):
+        keys = []
+        for post in context['page_obj']:
+            keys += get_post_keys(post)
+        return keys
+
+    def render_to_response(self, context, **response_kwargs):
+        return set_surrogate_keys(
+            super().render_to_response(context, **response_kwargs),
+            self.get_surrogate_keys(context)
+        )
+
+
+class SharedPageCacheMixin:
+    """Общая для всех копия страницы; анонимам отдаётся из кеша.
+
+    Пользовательские части страницы выносятся во фрагменты,
+    которые подставляет FragmentMiddleware.
+    """
+
+    def is_page_shareable(self):
+        return True
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(**kwargs, **{DEFER_FRAGMENTS: True})
+
+    def get(self, request, *args, **kwargs):
+        cacheable = not request.GET
+        if cacheable and not get_request_user(request).is_authenticated:
+            page = get_cached_page(request.path)
+            if page is not None:
+                content, headers = page
+                return HttpResponse(content, headers=headers)
+        response = super().get(request, *args, **kwargs)
+        response[FRAGMENTS_HEADER] = '1'
+        if cacheable and self.is_page_shareable():
+            response.add_post_render_callback(
+                lambda response: set_cached_page(
+                    request.path,
+                    (response.content, dict(response.headers))
+                )
+            )
+        return response
+
+
+class CoalescedGetMixin:
+    """Одинаковые одновременные анонимные запросы выполняются один раз."""
+
+    def get(self, request, *args, **kwargs):
+        def get_response():
+            return super(CoalescedGetMixin, self).get(
+                request, *args, **kwargs
+            )
+
+        if get_request_user(request).is_authenticated:
+            return get_response()
+        return coalescer.run(
+            f'{request.method}:{request.get_full_path()}',
+            get_response,
+            settings.COALESCING_TIMEOUT
+        )
+
+
+class CachedFeedMixin:
+    """Кеширует страницу общей ленты с защитой от лавинного пересчёта."""
+
+    def get_page_key(self):
+        """Номер страницы для ключа: без page, ?page=1 и ?page=01 — одна
+        запись; на прочие значения, как и ListView, отвечает 404.
+        """
+        page = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        if page == 'last':
+            return page
+        try:
+            return int(page)
+        except ValueError:
+            raise Http404('Неверный номер страницы')
+
+    def paginate_queryset(self, queryset, page_size):
+        def recompute():
+            paginator, page, object_list, _ = super(
+                CachedFeedMixin, self
+            ).paginate_queryset(queryset, page_size)
+            return paginator.count, page.number, list(object_list)
+
+        count, number, object_list = get_or_recompute(
+            get_feed_cache_key(self.request.path, self.get_page_key()),
+            recompute,
+            settings.FEED_CACHE_TIMEOUT
+        )
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty()
+        )
+        paginator.count = count
+        page = paginator.page(number)
+        page.object_list = object_list
+        return paginator, page, object_list, page.has_other_pages()
+
+
 class CheckAuthorMixin(UserPassesTestMixin):
 
     def test_func(self):
@@ -31,6 +172,7 @@ class CommentGeneralMixin:
     template_name = 'blog/comment.html'
     model = Comment
     pk_url_kwarg = 'comment_id'
+    query_budget = 10
 
     def get_success_url(self):
         return reverse(
@@ -86,6 +228,8 @@ class PostFormMixin:
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
+    # Включая чтение прежней версии для очистки её ключей в прокси
+    query_budget = 11
 
 
 class PostSuccessRedirectToProfileMixin:
@@ -130,36 +274,45 @@ class PostDeleteView(
     CheckAuthorMixin,
     DeleteView,
 ):
-    model = Post
+    # Подтверждение выводит краткое описание публикации, а не форму
+    queryset = Post.objects.defer('text', 'text_html').with_references()
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
+    query_budget = 10
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['form'] = PostForm()
-        context['form'].instance = kwargs['object']
-        return context
 
-
-class PostDetailView(DetailView):
+class PostDetailView(
+    CoalescedGetMixin,
+    SurrogateKeysMixin,
+    SharedPageCacheMixin,
+    DetailView
+):
     model = Post
+    queryset = Post.objects.join_related_all()
     pk_url_kwarg = 'post_id'
     template_name = 'blog/detail.html'
+    query_budget = 8
 
     def get_object(self, posts=None):
         post = super().get_object(posts)
-        if post.author == self.request.user:
+        if post.author == get_request_user(self.request):
             return post
         post = super().get_object(
-            Post.objects.filter_valid()
+            self.queryset.filter_valid()
         )
         return post
 
+    def is_page_shareable(self):
+        return Post.objects.filter_valid().filter(pk=self.object.pk).exists()
+
+    def get_surrogate_keys(self, context):
+        return get_post_keys(self.object)
+
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
             form=CommentForm(),
-            comments=kwargs['object'].comments.all()
+            comments=kwargs['object'].comments.select_related('author')
         )
 
 
@@ -168,15 +321,18 @@ class ProfileEditView(LoginRequiredMixin, UpdateView):
     template_name = 'registration/registration_form.html'
     form_class = UserChangeInfoForm
     success_url = reverse_lazy('blog:index')
+    query_budget = 5
 
     def get_object(self, user_arg=None):
         return self.request.user
 
 
-class ProfileView(ListView):
+class ProfileView(SurrogateKeysMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = MAX_POSTS_PER_PAGE
+    paginator_class = ElidedPaginator
+    query_budget = 8
 
     def get_author(self):
         return get_object_or_404(
@@ -186,7 +342,7 @@ class ProfileView(ListView):
 
     def get_queryset(self):
         author = self.get_author()
-        return author.posts.join_related_all(
+        return author.posts.for_feed(
         ).filter_valid(
             access_to_hidden=self.request.user == author
         ).add_comment_count()
@@ -197,19 +353,27 @@ class ProfileView(ListView):
             profile=self.get_author()
         )
 
+    def get_surrogate_keys(self, context):
+        return [
+            get_author_key(context['profile']),
+            *super().get_surrogate_keys(context)
+        ]
+
 
 # Классы общего контента блога
-class CategoryView(ListView):
+class CategoryView(SurrogateKeysMixin, CachedFeedMixin, ListView):
     model = Post
     template_name = 'blog/category.html'
     paginate_by = MAX_POSTS_PER_PAGE
+    paginator_class = ElidedPaginator
+    query_budget = 8
 
     def get_queryset(self):
         return get_object_or_404(
             Category,
             slug=self.kwargs['category_slug'],
             is_published=True
-        ).posts.join_related_all(
+        ).posts.for_feed(
         ).filter_valid(
         ).add_comment_count()
 
@@ -222,13 +386,69 @@ class CategoryView(ListView):
             )
         )
 
+    def get_surrogate_keys(self, context):
+        return [
+            get_category_key(context['category']),
+            *super().get_surrogate_keys(context)
+        ]
 
-class IndexView(ListView):
+
+class IndexView(SurrogateKeysMixin, CachedFeedMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = MAX_POSTS_PER_PAGE
+    paginator_class = ElidedPaginator
+    query_budget = 6
 
     def get_queryset(self):
-        return Post.objects.join_related_all(
+        return Post.objects.for_feed(
         ).filter_valid(
         ).add_comment_count()
+
+    def get_surrogate_keys(self, context):
+        return [FEED_KEY, *super().get_surrogate_keys(context)]
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    """Варианты для AutocompleteSelect по началу введённого текста."""
+
+    def get(self, request, source):
+        if source not in references:
+            raise Http404
+        return JsonResponse({'results': [
+            {'id': obj.pk, 'text': str(obj)}
+            for obj in references[source].search(
+                request.GET.get('q', ''), settings.AUTOCOMPLETE_LIMIT
+            )
+        ]})
+
+
+class MetricsView(View):
+    """Метрики всех процессов в текстовом формате Prometheus."""
+
+    def get(self, request):
+        if not settings.METRICS_ENABLED:
+            raise Http404
+        if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+            return HttpResponseForbidden()
+        return HttpResponse(
+            render_prometheus(*collect()),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class ProfileDownloadView(UserPassesTestMixin, View):
+    """Отдаёт персоналу сохранённый профиль запроса."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, name):
+        path = get_profile_path(name)
+        if path is None:
+            raise Http404
+        return FileResponse(
+            path.open('rb'),
+            as_attachment=True,
+            content_type='text/plain; charset=utf-8'
+        )
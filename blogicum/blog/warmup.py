@@ -0,0 +1,49 @@
+import logging
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+
+logger = logging.getLogger(__name__)
+
+# Переопределения админки тянут её шаблоны, нужные только персоналу
+EXCLUDED_PREFIXES = ('admin/',)
+
+
+def get_template_names(engine):
+    """Имена шаблонов проекта в каталогах загрузчиков движка.
+
+    Каталоги сторонних пакетов и Django пропускаются.
+    """
+    project_dir = Path(settings.BASE_DIR).resolve()
+    names = set()
+    for loader in engine.template_loaders:
+        for directory in map(Path, loader.get_dirs()):
+            if not directory.resolve().is_relative_to(project_dir):
+                continue
+            for path in directory.rglob('*.html'):
+                name = path.relative_to(directory).as_posix()
+                if not name.startswith(EXCLUDED_PREFIXES):
+                    names.add(name)
+    return sorted(names)
+
+
+def warm_up_templates():
+    """Компилирует шаблоны проекта в кеш загрузчика до первого запроса.
+
+    Заодно регистрируются фрагменты {% userfragment %}. Шаблоны
+    с ошибками пропускаются. Возвращает число скомпилированных.
+    """
+    compiled = 0
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        for name in get_template_names(engine):
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                logger.warning('Шаблон %s не скомпилирован: %s', name, error)
+                continue
+            compiled += 1
+    return compiled
@@ -0,0 +1,25 @@
+from django.forms import Select
+
+from .urlbuilder import build_url
+
+
+class AutocompleteSelect(Select):
+    """Список, варианты которого подгружаются по мере ввода.
+
+    Форма отдаёт в HTML только выбранный вариант; остальные скрипт
+    запрашивает у blog:autocomplete по началу введённого текста.
+    """
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def __init__(self, source, attrs=None):
+        super().__init__(attrs)
+        self.source = source
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = build_url(
+            'blog:autocomplete', self.source
+        )
+        return context
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_asgi_application()
+
+# Импорт после настройки Django: модули blog читают settings
+from blog.warmup import warm_up_templates  # noqa: E402
+
+warm_up_templates()
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 from django.urls import reverse_lazy
 
@@ -17,6 +19,13 @@ from django.urls import reverse_lazy
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Файлы, которые сервер пишет во время работы: метрики, профили,
+# статистика, журнал запросов; вне репозитория
+VAR_DIR = Path(os.environ.get(
+    'BLOGICUM_VAR_DIR',
+    Path(tempfile.gettempdir()) / 'blogicum'
+))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -45,13 +54,22 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.middleware.ServerTimingMiddleware',
+    'blog.middleware.MetricsMiddleware',
+    'blog.middleware.TrafficCaptureMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'blog.middleware.ProfilingMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.middleware.QueryBudgetMiddleware',
+    'blog.middleware.SlowQueryMiddleware',
+    'blog.middleware.MemoryProfilingMiddleware',
+    'blog.middleware.FragmentMiddleware',
+    'blog.middleware.ViewTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'blogicum.urls'
@@ -60,7 +78,6 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -68,6 +85,14 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Скомпилированные шаблоны хранятся в памяти процесса;
+            # при DEBUG кеш сбрасывается автоперезагрузкой
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -92,6 +117,89 @@ DATABASES = {
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Кеш пользователя сессии, лент, страниц и поколения справочников
+# сбрасываются через общий кеш, поэтому при нескольких процессах нужен
+# Redis: адрес берётся из REDIS_URL
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Общий ли кеш для всех процессов сервера; None — определить по бэкенду.
+# С кешем в памяти процесса эти кеши отключены: сброс в одном процессе
+# не виден остальным. True допустимо, когда процесс один
+CACHE_SHARED = None
+
+# Время жизни общей копии страницы, в секундах
+PAGE_CACHE_TIMEOUT = 60
+
+# Время жизни закешированной страницы ленты, в секундах
+FEED_CACHE_TIMEOUT = 30
+
+# Сколько одинаковый запрос ждёт ответ ведущего запроса, в секундах
+COALESCING_TIMEOUT = 5
+
+# Журнал запросов для прогрева кеша и нагрузочного тестирования
+TRAFFIC_LOG_PATH = VAR_DIR / 'requests.jsonl'
+
+# Доля запросов, записываемых в журнал; 0 — запись отключена
+TRAFFIC_SAMPLE_RATE = 0
+
+# Не записываются: в адресах сброса пароля токены, в админке личные данные
+TRAFFIC_EXCLUDED_PATHS = ('/auth/', '/admin/', '/profiling/')
+
+# Параметры запроса, значения которых пишутся в журнал; прочие скрываются
+TRAFFIC_KEPT_PARAMS = ('page',)
+
+# Запросы к БД дольше стольких миллисекунд пишутся в blog.slow_queries
+SLOW_QUERY_THRESHOLD = 100
+
+# Сколько одинаковых по форме запросов к БД считается N+1
+QUERY_REPEAT_THRESHOLD = 5
+
+# Превышение бюджета запросов: True — исключение, False — запись в журнал
+QUERY_BUDGET_RAISE = DEBUG
+
+# Время жизни HTML незаполненных форм; в форме публикации время
+# по умолчанию может отставать на столько секунд
+FORM_CACHE_TIMEOUT = 60
+
+# Как часто процесс сверяет свою копию категорий и местоположений
+# с общим поколением, в секундах
+REFERENCE_CHECK_INTERVAL = 1
+
+# Сколько вариантов отдаёт автодополнение полей формы публикации
+AUTOCOMPLETE_LIMIT = 20
+
+# До скольких строк считают списки публикаций и комментариев в админке
+ADMIN_COUNT_LIMIT = 10000
+
+# Сколько строк меняет один UPDATE или DELETE массовой модерации
+MODERATION_BATCH_SIZE = 1000
+
+# Доля запросов, фазы которых замеряются и пишутся в журнал blog.timing;
+# запросы персонала с заголовком X-Server-Timing замеряются всегда
+SERVER_TIMING_SAMPLE_RATE = 0
+
+# Очистка кеша обратного прокси по Surrogate-Key; для Varnish/Fastly:
+# {'BACKEND': 'blog.purge.HttpPurger', 'OPTIONS': {'URL': '...'}}
+CACHE_PURGER = {
+    'BACKEND': 'blog.purge.NullPurger',
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -112,6 +220,13 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # Auth config
 
+AUTHENTICATION_BACKENDS = [
+    'blog.backends.CachedModelBackend',
+]
+
+# Время жизни закешированного пользователя сессии, в секундах
+USER_CACHE_TIMEOUT = 60
+
 LOGIN_REDIRECT_URL = reverse_lazy('blog:index')
 
 LOGIN_URL = reverse_lazy('login')
@@ -155,3 +270,49 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 INTERNAL_IPS = [
     '127.0.0.1'
 ]
+
+# Эндпоинт /metrics в формате Prometheus и адреса, которым он доступен
+METRICS_ENABLED = False
+METRICS_ALLOWED_IPS = INTERNAL_IPS
+
+# Каталог, куда процессы сбрасывают метрики, и период сброса в секундах
+METRICS_DIR = VAR_DIR / 'metrics'
+METRICS_FLUSH_INTERVAL = 5
+
+# Профили запросов персонала: период выборки стеков в секундах,
+# каталог и сколько последних профилей хранить
+PROFILE_SAMPLE_INTERVAL = 0.002
+PROFILE_DIR = VAR_DIR / 'profiles'
+PROFILE_MAX_FILES = 100
+
+# Сбор статистики запросов по формам для команды query_stats и её каталог
+QUERY_STATS_ENABLED = False
+QUERY_STATS_DIR = VAR_DIR / 'query_stats'
+
+# Доля запросов, пик памяти которых замеряется tracemalloc, и каталог
+# статистики для команды memory_stats
+MEMORY_PROFILE_SAMPLE_RATE = 0
+MEMORY_STATS_DIR = VAR_DIR / 'memory_stats'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'verbose': {
+            'format': '{asctime} {levelname} {name}: {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
+        },
+    },
+    'loggers': {
+        'blog': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
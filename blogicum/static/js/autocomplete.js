@@ -0,0 +1,30 @@
+// Подгружает варианты списков с data-autocomplete-url по мере ввода
+const AUTOCOMPLETE_DELAY = 250;
+
+document.querySelectorAll('select[data-autocomplete-url]').forEach((select) => {
+  const search = document.createElement('input');
+  search.type = 'search';
+  search.className = 'form-control mb-1';
+  search.placeholder = 'Начните вводить название';
+  select.before(search);
+  let timer;
+  search.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const url = new URL(select.dataset.autocompleteUrl, window.location.href);
+      url.searchParams.set('q', search.value);
+      const response = await fetch(url);
+      if (!response.ok) {
+        return;
+      }
+      const { results } = await response.json();
+      const kept = [...select.options].filter(
+        (option) => option.value === '' || option.selected
+      );
+      const options = results
+        .filter(({ id }) => !kept.some((option) => option.value === String(id)))
+        .map(({ id, text }) => new Option(text, id));
+      select.replaceChildren(...kept, ...options);
+    }, AUTOCOMPLETE_DELAY);
+  });
+});
@@ -19,6 +19,7 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -26,6 +27,8 @@ from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
 
+from blog.querysets import strict_deferred_fields
+
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
@@ -41,6 +44,41 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def enforce_query_budgets():
+    with override_settings(QUERY_BUDGET_RAISE=True):
+        with strict_deferred_fields():
+            yield
+
+
+@pytest.fixture(autouse=True)
+def isolate_process_stats(tmp_path):
+    with override_settings(
+        QUERY_STATS_DIR=tmp_path / 'query_stats',
+        MEMORY_STATS_DIR=tmp_path / 'memory_stats'
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def shared_cache():
+    # Тесты идут в одном процессе, поэтому LocMemCache для них общий
+    with override_settings(CACHE_SHARED=True):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from blog.reference import categories, locations
+
+    cache.clear()
+    # Поколения справочников хранятся в кеше и сбрасываются вместе с ним
+    categories.reset()
+    locations.reset()
+    yield
+    cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -133,6 +171,13 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def staff_client(mixer):
+    client = Client()
+    client.force_login(mixer.blend('auth.User', is_staff=True))
+    return client
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+def test_post_changelist_queries(
+    admin_client, mixer, django_assert_max_num_queries
+):
+    for year in (2020, 2020, 2023):
+        post = mixer.blend(
+            'blog.Post',
+            pub_date=timezone.make_aware(datetime(year, 5, 1))
+        )
+        mixer.cycle(2).blend('blog.Comment', post=post)
+    admin_client.get('/admin/blog/post/')
+    with django_assert_max_num_queries(15) as context:
+        response = admin_client.get('/admin/blog/post/')
+    sql = ' '.join(query['sql'] for query in context.captured_queries)
+    assert 'DISTINCT' not in sql and 'GROUP BY "blog_post"' not in sql, (
+        'Убедитесь, что список публикаций в админке не перебирает всю '
+        'таблицу для иерархии дат и числа комментариев.'
+    )
+    content = response.content.decode()
+    assert '?pub_date__year=2020' in content
+    assert '?pub_date__year=2023' in content
+    assert '?pub_date__year=2021' not in content, (
+        'Убедитесь, что иерархия дат показывает только годы с публикациями.'
+    )
+    assert response.context['cl'].result_list[0].comment_count == 2
+
+
+@pytest.mark.django_db
+def test_changelist_count_capped(admin_client, mixer, settings):
+    settings.ADMIN_COUNT_LIMIT = 3
+    mixer.cycle(5).blend('blog.Comment')
+    response = admin_client.get('/admin/blog/comment/')
+    assert response.context['cl'].result_count == 3, (
+        'Убедитесь, что список комментариев в админке считает строки '
+        'не дальше ADMIN_COUNT_LIMIT.'
+    )
+    assert response.context['cl'].full_result_count is None
+
+
+@pytest.mark.django_db
+def test_date_hierarchy_far_future(admin_client, mixer):
+    for year in (2020, 9000):
+        mixer.blend(
+            'blog.Post',
+            pub_date=timezone.make_aware(datetime(year, 1, 1))
+        )
+    with CaptureQueriesContext(connection) as context:
+        content = admin_client.get('/admin/blog/post/').content.decode()
+    assert '?pub_date__year=2020' in content
+    assert '?pub_date__year=9000' in content, (
+        'Убедитесь, что иерархия дат работает и для далёких дат, '
+        'не отправляя столбец на каждый год.'
+    )
+    assert len([
+        query for query in context.captured_queries
+        if 'MIN(' in query['sql'].upper()
+    ]) == 1, (
+        'Убедитесь, что иерархия дат не запрашивает первую и последнюю '
+        'дату повторно.'
+    )
@@ -0,0 +1,103 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.forms import PostForm
+from blog.models import Post, User
+
+
+@pytest.mark.django_db
+def test_post_form_renders_selected_choice_only(mixer, published_category):
+    mixer.cycle(3).blend('blog.Category')
+    content = PostForm(initial={'category': published_category.pk}).as_p()
+    assert content.count('<option') == 2 + 1, (
+        'Убедитесь, что форма публикации выводит только выбранные '
+        'категорию и местоположение, а не все варианты.'
+    )
+    assert str(published_category) in content
+    assert 'data-autocomplete-url="/autocomplete/category/"' in content
+
+
+@pytest.mark.django_db
+def test_autocomplete_prefix(user_client, client, mixer):
+    mixer.blend('blog.Location', name='Москва')
+    mixer.blend('blog.Location', name='Мурманск')
+    mixer.blend('blog.Location', name='Самара, Москворецкая')
+    response = user_client.get('/autocomplete/location/', {'q': 'мо'})
+    assert [item['text'] for item in response.json()['results']] == [
+        'Москва'
+    ], (
+        'Убедитесь, что автодополнение ищет местоположения по началу '
+        'названия без учёта регистра.'
+    )
+    assert user_client.get('/autocomplete/user/').status_code == 404
+    assert client.get('/autocomplete/location/').status_code == 302, (
+        'Убедитесь, что автодополнение доступно только вошедшим '
+        'пользователям.'
+    )
+
+
+@pytest.mark.django_db
+def test_prefix_lookup_uses_range(mixer):
+    mixer.blend('blog.Post', title='Автодополнение')
+    mixer.blend('blog.Post', title='Автобус')
+    mixer.blend('blog.Post', title='Не автодополнение')
+    with CaptureQueriesContext(connection) as queries:
+        titles = sorted(
+            Post.objects.filter(title__prefix='Автодоп')
+            .values_list('title', flat=True)
+        )
+    assert titles == ['Автодополнение']
+    assert 'LIKE' not in queries[0]['sql'], (
+        'Убедитесь, что поиск по началу значения сравнивает с диапазоном, '
+        'а не через LIKE.'
+    )
+
+
+@pytest.mark.django_db
+def test_admin_autocomplete(admin_client, mixer):
+    author = mixer.blend(User, username='spammer')
+    mixer.blend(User, username='not_spammer')
+    response = admin_client.get('/admin/autocomplete/', {
+        'term': 'spam',
+        'app_label': 'blog',
+        'model_name': 'post',
+        'field_name': 'author',
+    })
+    assert [item['id'] for item in response.json()['results']] == [
+        str(author.pk)
+    ], (
+        'Убедитесь, что поле автора в админке публикаций использует '
+        'автодополнение по началу имени пользователя.'
+    )
+    post = mixer.blend('blog.Post', title='Morning in the hills')
+    response = admin_client.get('/admin/autocomplete/', {
+        'term': 'morning in',
+        'app_label': 'blog',
+        'model_name': 'comment',
+        'field_name': 'post',
+    })
+    assert [item['id'] for item in response.json()['results']] == [
+        str(post.pk)
+    ], (
+        'Убедитесь, что автодополнение ищет по началу названия всю '
+        'введённую строку, а не отдельные слова.'
+    )
+    content = admin_client.get('/admin/blog/comment/add/').content.decode()
+    assert 'admin-autocomplete' in content
+
+
+@pytest.mark.django_db
+def test_admin_changelist_keeps_stock_search(admin_client, mixer):
+    post = mixer.blend('blog.Post', title='Morning in the hills')
+    user = mixer.blend(User, username='walker', email='walker@hills.test')
+    response = admin_client.get('/admin/blog/post/', {'q': 'HILLS morning'})
+    assert list(response.context['cl'].result_list) == [post], (
+        'Убедитесь, что поиск в списке админки остаётся стандартным: '
+        'по словам и без учёта регистра.'
+    )
+    response = admin_client.get('/admin/auth/user/', {'q': 'hills.test'})
+    assert list(response.context['cl'].result_list) == [user], (
+        'Убедитесь, что пользователей в админке можно искать по всем '
+        'стандартным полям UserAdmin.'
+    )
@@ -0,0 +1,204 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+
+from blog.cache import get_cached_page, get_or_recompute, set_cached_page
+from blog.coalescing import RequestCoalescer
+from blog.fragments import make_fragment_marker, render_fragments
+from blog.middleware import FragmentMiddleware
+
+N_CONCURRENT_REQUESTS = 20
+
+
+def get_user_queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url)
+    return [q for q in ctx.captured_queries if 'auth_user' in q['sql']]
+
+
+@pytest.mark.django_db
+def test_session_user_is_cached(user_client):
+    get_user_queries(user_client, '/pages/about/')
+    assert not get_user_queries(user_client, '/pages/about/'), (
+        'Убедитесь, что пользователь сессии загружается из кеша '
+        'при повторных запросах.'
+    )
+
+
+@pytest.mark.django_db
+def test_cached_user_invalidated_on_save(user, user_client):
+    get_user_queries(user_client, '/pages/about/')
+    user.first_name = 'Changed'
+    user.save()
+    assert get_user_queries(user_client, '/pages/about/'), (
+        'Убедитесь, что кеш пользователя сбрасывается при его сохранении.'
+    )
+
+
+@pytest.mark.django_db
+def test_process_local_cache_disables_shared_caches(user_client, settings):
+    settings.CACHE_SHARED = None
+    get_user_queries(user_client, '/pages/about/')
+    assert get_user_queries(user_client, '/pages/about/'), (
+        'Убедитесь, что с кешем в памяти процесса пользователь сессии '
+        'не кешируется: сброс не дойдёт до других процессов.'
+    )
+    set_cached_page('/posts/1/', b'page')
+    assert get_cached_page('/posts/1/') is None, (
+        'Убедитесь, что с кешем в памяти процесса общие копии страниц '
+        'не кешируются.'
+    )
+    calls = []
+    for _ in range(2):
+        get_or_recompute('feed:key', lambda: calls.append(1), 60)
+    assert len(calls) == 2
+
+
+@pytest.mark.django_db
+def test_anonymous_detail_page_is_shared(
+        client, user_client, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    response = client.get(url)
+    assert 'Cookie' not in response.get('Vary', ''), (
+        'Убедитесь, что страница публикации для анонимного пользователя '
+        'не обращается к сессии.'
+    )
+    with CaptureQueriesContext(connection) as ctx:
+        cached_response = client.get(url)
+    assert not ctx.captured_queries, (
+        'Убедитесь, что повторный анонимный запрос страницы публикации '
+        'отдаётся из кеша.'
+    )
+    assert cached_response.content == response.content
+
+    author_content = user_client.get(url).content.decode('utf-8')
+    assert f'/posts/{post_with_published_location.id}/edit/' in (
+        author_content
+    ), (
+        'Убедитесь, что автор видит ссылку на редактирование публикации '
+        'на общей закешированной странице.'
+    )
+    assert '<!--fragment:' not in author_content
+
+
+@pytest.mark.django_db
+def test_cached_detail_page_shows_renamed_author(
+        client, user, post_with_published_location
+):
+    url = f'/posts/{post_with_published_location.id}/'
+    client.get(url)
+    user.username = 'renamed_author'
+    user.save()
+    content = client.get(url).content.decode('utf-8')
+    assert '/profile/renamed_author/' in content, (
+        'Убедитесь, что после смены имени автора закешированная страница '
+        'публикации показывает новое имя и ссылку на профиль.'
+    )
+
+
+def test_fragments_only_in_marked_html(rf):
+    marker = make_fragment_marker('includes/header.html:22', {})
+    response = FragmentMiddleware(
+        lambda request: HttpResponse(
+            marker, content_type='application/json'
+        )
+    )(rf.get('/'))
+    assert response.content.decode() == marker, (
+        'Убедитесь, что FragmentMiddleware не трогает ответы без '
+        'заголовка от SharedPageCacheMixin.'
+    )
+    # Последний символ подписи перед '-->'
+    forged = marker[:-4] + ('B' if marker[-4] == 'A' else 'A') + '-->'
+    assert render_fragments(forged, rf.get('/')) == '', (
+        'Убедитесь, что метки фрагментов с неверной подписью '
+        'не выполняются.'
+    )
+
+
+def run_concurrently(target):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(target()))
+        for _ in range(N_CONCURRENT_REQUESTS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def make_slow_recompute(calls, value):
+    def recompute():
+        calls.append(value)
+        time.sleep(0.2)
+        return value
+    return recompute
+
+
+def test_single_recompute_on_cold_cache():
+    calls = []
+    results = run_concurrently(lambda: get_or_recompute(
+        'test:cold', make_slow_recompute(calls, 'fresh'), 60
+    ))
+    assert len(calls) == 1, (
+        'Убедитесь, что при пустом кеше значение пересчитывает '
+        'только один поток.'
+    )
+    assert results == ['fresh'] * N_CONCURRENT_REQUESTS
+
+
+def test_stale_value_served_while_recomputing():
+    cache.set('test:stale', ('stale', time.time() - 1, 0.2), 60)
+    calls = []
+    results = run_concurrently(lambda: get_or_recompute(
+        'test:stale', make_slow_recompute(calls, 'fresh'), 60
+    ))
+    assert len(calls) == 1, (
+        'Убедитесь, что устаревшее значение пересчитывает только один поток.'
+    )
+    assert results.count('stale') == N_CONCURRENT_REQUESTS - 1, (
+        'Убедитесь, что во время пересчёта остальные потоки получают '
+        'устаревшее значение.'
+    )
+    assert get_or_recompute('test:stale', lambda: 'other', 60) == 'fresh'
+
+
+def test_identical_requests_are_coalesced():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    def get_response():
+        return HttpResponse(make_slow_recompute(calls, b'page')())
+
+    results = run_concurrently(
+        lambda: coalescer.run('GET:/posts/1/', get_response, 5).content
+    )
+    assert len(calls) == 1, (
+        'Убедитесь, что одинаковые одновременные запросы выполняются '
+        'представлением один раз.'
+    )
+    assert results == [b'page'] * N_CONCURRENT_REQUESTS
+    assert coalescer.stats['collapsed'] == N_CONCURRENT_REQUESTS - 1
+
+
+@pytest.mark.django_db
+def test_feed_cache_key_normalized(client, post_with_published_location):
+    client.get('/')
+    with CaptureQueriesContext(connection) as ctx:
+        for query in ('?page=1', '?page=01', ''):
+            client.get(f'/{query}')
+    assert not [
+        query for query in ctx.captured_queries
+        if 'blog_post' in query['sql']
+    ], (
+        'Убедитесь, что лента без номера страницы и с ?page=1 берётся '
+        'из одной записи кеша.'
+    )
+    assert client.get('/?page=junk').status_code == 404
@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+import pytest
+from django.forms import ModelForm
+from django.template import Context, Template
+
+from blog.forms import CommentForm
+
+FORM_TEMPLATE = Template(
+    '{% load blog_forms %}{% bootstrap_form_cached form %}'
+)
+
+
+def render_form(form):
+    return FORM_TEMPLATE.render(Context({'form': form}))
+
+
+@pytest.mark.django_db
+def test_unbound_form_cached():
+    with patch(
+        'blog.templatetags.blog_forms.render_form',
+        return_value='<input name="text">'
+    ) as render:
+        assert render_form(CommentForm()) == render_form(CommentForm())
+        assert render.call_count == 1, (
+            'Убедитесь, что HTML незаполненной формы кешируется.'
+        )
+        render_form(CommentForm(data={'text': 'Текст'}))
+        assert render.call_count == 2, (
+            'Убедитесь, что заполненные формы не берутся из кеша.'
+        )
+
+
+@pytest.mark.django_db
+def test_form_options_not_shared():
+    with patch(
+        'blog.templatetags.blog_forms.render_form',
+        side_effect=lambda form: f'{form.prefix}:{form.auto_id}'
+    ):
+        render_form(CommentForm())
+        assert render_form(CommentForm(prefix='other')) == 'other:id_%s'
+        assert render_form(CommentForm(auto_id=False)) == 'None:False', (
+            'Убедитесь, что prefix и auto_id формы входят в ключ кеша.'
+        )
+    with patch(
+        'blog.templatetags.blog_forms.render_form',
+        return_value='<input name="text">'
+    ) as render:
+        for _ in range(2):
+            render_form(CommentForm(initial={'text': 'Черновик'}))
+        assert render.call_count == 2, (
+            'Убедитесь, что формы с initial не берутся из кеша.'
+        )
+
+
+@pytest.mark.django_db
+def test_delete_confirmation_without_post_form(
+    user_client, post_with_published_location
+):
+    response = user_client.get(
+        f'/posts/{post_with_published_location.id}/delete/'
+    )
+    assert not isinstance(response.context.get('form'), ModelForm), (
+        'Убедитесь, что страница удаления публикации не строит форму '
+        'публикации.'
+    )
+    assert post_with_published_location.title in response.content.decode()
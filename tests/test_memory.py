@@ -0,0 +1,46 @@
+import tracemalloc
+
+import pytest
+from django.core.management import call_command
+
+from blog.memory import memory_stats
+
+
+@pytest.mark.django_db
+def test_memory_stats(client, settings, capsys, post_with_published_location):
+    settings.MEMORY_PROFILE_SAMPLE_RATE = 1
+    client.get(f'/posts/{post_with_published_location.id}/')
+    client.get('/')
+    call_command('memory_stats')
+    output = capsys.readouterr().out
+    for view_name in ('blog:post_detail', 'blog:index'):
+        assert f'{view_name}: замеров 1' in output, (
+            'Убедитесь, что команда memory_stats выводит пик памяти '
+            f'представления {view_name}.'
+        )
+    assert 'КиБ  ' in output, (
+        'Убедитесь, что команда memory_stats выводит места выделения памяти.'
+    )
+
+
+@pytest.mark.django_db
+def test_memory_profiling_disabled(client):
+    before = memory_stats.snapshot()
+    client.get('/')
+    assert memory_stats.snapshot() == before, (
+        'Убедитесь, что по умолчанию память не замеряется.'
+    )
+
+
+@pytest.mark.django_db
+def test_memory_profiling_keeps_outer_tracing(client, settings):
+    settings.MEMORY_PROFILE_SAMPLE_RATE = 1
+    tracemalloc.start()
+    try:
+        client.get('/')
+        assert tracemalloc.is_tracing(), (
+            'Убедитесь, что замер памяти не останавливает трассировку, '
+            'запущенную до него.'
+        )
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def metrics_dir(settings, tmp_path):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_DIR = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_metrics_disabled(client, settings):
+    settings.METRICS_ENABLED = False
+    assert client.get('/metrics').status_code == 404, (
+        'Убедитесь, что при METRICS_ENABLED = False эндпоинт /metrics '
+        'недоступен.'
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_forbidden(client, metrics_dir, settings):
+    settings.METRICS_ALLOWED_IPS = []
+    assert client.get('/metrics').status_code == 403, (
+        'Убедитесь, что /metrics отдаётся только адресам из '
+        'METRICS_ALLOWED_IPS.'
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_exposition(client, metrics_dir):
+    client.get('/')
+    response = client.get('/metrics')
+    assert response['Content-Type'].startswith('text/plain'), (
+        'Убедитесь, что метрики отдаются в текстовом формате Prometheus.'
+    )
+    content = response.content.decode()
+    for line in (
+        '# TYPE blog_request_duration_seconds histogram',
+        'blog_request_duration_seconds_bucket{view="blog:index",le="+Inf"}',
+        'blog_requests_total{status="200",view="blog:index"}',
+        'blog_db_queries_total{view="blog:index"}',
+        'blog_cache_requests_total{cache="feed",result="miss"}',
+    ):
+        assert line in content, (
+            f'Убедитесь, что /metrics содержит `{line}`.'
+        )
+
+
+@pytest.mark.django_db
+def test_metrics_merged_across_processes(client, metrics_dir):
+    (metrics_dir / '1.json').write_text(json.dumps({
+        'counters': [
+            ['blog_request_errors_total', [['view', 'blog:fake']], 3]
+        ],
+        'histograms': [],
+    }))
+    content = client.get('/metrics').content.decode()
+    assert 'blog_request_errors_total{view="blog:fake"} 3' in content, (
+        'Убедитесь, что /metrics суммирует метрики всех процессов.'
+    )
@@ -0,0 +1,145 @@
+import pytest
+from django.contrib.admin.models import DELETION, LogEntry
+from django.core.management import CommandError, call_command
+from django.db import models
+from django.test import override_settings
+
+from blog.cache import get_generation
+from blog.models import Comment, Post
+from blog.moderation import Moderation
+from blog.purge import LocMemPurger
+from blog.reference import categories
+
+
+@pytest.fixture
+def purged_keys():
+    LocMemPurger.purged.clear()
+    with override_settings(
+        CACHE_PURGER={'BACKEND': 'blog.purge.LocMemPurger'}
+    ):
+        yield LocMemPurger.purged
+    LocMemPurger.purged.clear()
+
+
+@pytest.mark.django_db
+def test_admin_unpublish_in_batches(
+    admin_client, mixer, settings, purged_keys,
+    django_capture_on_commit_callbacks
+):
+    settings.MODERATION_BATCH_SIZE = 2
+    posts = mixer.cycle(5).blend('blog.Post', is_published=True)
+    generation = get_generation('feed')
+    with django_capture_on_commit_callbacks(execute=True):
+        response = admin_client.post('/admin/blog/post/', {
+            'action': 'unpublish',
+            '_selected_action': [post.pk for post in posts],
+        }, follow=True)
+    assert not Post.objects.filter(is_published=True).exists()
+    assert 'Снято с публикации: 5' in response.content.decode(), (
+        'Убедитесь, что действие админки сообщает число изменённых строк.'
+    )
+    assert get_generation('feed') == generation + 1, (
+        'Убедитесь, что массовая модерация сбрасывает кеш один раз, '
+        'а не для каждой строки.'
+    )
+    assert len(purged_keys) == 1
+    assert {'feed', f'author:{posts[0].author.username}'} <= set(
+        purged_keys[0]
+    )
+
+
+@pytest.mark.django_db
+def test_admin_delete_confirms_with_counts(admin_client, mixer):
+    posts = mixer.cycle(3).blend('blog.Post')
+    mixer.cycle(4).blend('blog.Comment', post=posts[0])
+    data = {
+        'action': 'delete_selected',
+        '_selected_action': [post.pk for post in posts],
+    }
+    content = admin_client.post('/admin/blog/post/', data).content.decode()
+    assert Post.objects.count() == 3, (
+        'Убедитесь, что удаление выбранных в админке сначала '
+        'запрашивает подтверждение.'
+    )
+    assert 'Публикации: 3' in content and 'Комментарии: 4' in content, (
+        'Убедитесь, что страница подтверждения показывает число '
+        'удаляемых строк каждой модели.'
+    )
+    assert posts[0].title not in content
+    response = admin_client.post(
+        '/admin/blog/post/', {**data, 'post': 'yes'}, follow=True
+    )
+    assert 'Удалено: 3' in response.content.decode()
+    assert not Post.objects.exists() and not Comment.objects.exists()
+    assert list(LogEntry.objects.values_list('action_flag', flat=True)) == [
+        DELETION
+    ], (
+        'Убедитесь, что массовое удаление пишет в журнал админки одну '
+        'запись.'
+    )
+
+
+@pytest.mark.django_db
+def test_moderate_command_deletes_comments(mixer, capsys):
+    spammer, author = mixer.cycle(2).blend('auth.User')
+    post = mixer.blend('blog.Post')
+    mixer.cycle(3).blend('blog.Comment', post=post, author=spammer)
+    mixer.blend('blog.Comment', post=post, author=author)
+    call_command(
+        'moderate', 'delete', 'comment',
+        '--filter', f'author__username={spammer.username}',
+        '--batch-size', '2'
+    )
+    assert 'Изменено записей: 3' in capsys.readouterr().out
+    assert list(Comment.objects.values_list('author', flat=True)) == [
+        author.pk
+    ], (
+        'Убедитесь, что команда moderate удаляет только подходящие '
+        'под --filter записи.'
+    )
+
+
+@pytest.mark.django_db
+def test_delete_category_keeps_posts(mixer, published_category):
+    post = mixer.blend('blog.Post', category=published_category)
+    categories.get_objects()
+    call_command(
+        'moderate', 'delete', 'category',
+        '--filter', f'slug={published_category.slug}'
+    )
+    post.refresh_from_db()
+    assert post.category_id is None, (
+        'Убедитесь, что удаление категорий оставляет их публикации '
+        'без категории.'
+    )
+    assert categories.get(published_category.pk) is None, (
+        'Убедитесь, что массовая модерация сбрасывает справочник категорий.'
+    )
+
+
+@pytest.mark.django_db
+def test_moderate_command_post_delete_cascades(mixer):
+    post = mixer.blend('blog.Post')
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    call_command('moderate', 'delete', 'post', '--all')
+    assert not Comment.objects.exists(), (
+        'Убедитесь, что удаление публикаций удаляет их комментарии.'
+    )
+
+
+@pytest.mark.django_db
+def test_delete_respects_protect(mixer, monkeypatch):
+    post = mixer.blend('blog.Post')
+    mixer.blend('blog.Comment', post=post)
+    monkeypatch.setattr(
+        Post._meta.get_field('comments'), 'on_delete', models.PROTECT
+    )
+    assert not Moderation(Post.objects.all()).get_cascaded(), (
+        'Убедитесь, что get_cascaded() возвращает только связи CASCADE.'
+    )
+    with pytest.raises(CommandError):
+        call_command('moderate', 'delete', 'post', '--all')
+    assert Post.objects.filter(pk=post.pk).exists(), (
+        'Убедитесь, что массовое удаление не обходит PROTECT '
+        'у зависимых строк.'
+    )
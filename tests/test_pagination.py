@@ -0,0 +1,25 @@
+from django.template.loader import render_to_string
+
+from blog.pagination import ElidedPaginator
+
+N_PAGES = 100_000
+
+
+def test_elided_page_range():
+    page = ElidedPaginator(range(N_PAGES), 1).page(N_PAGES // 2)
+    ellipsis = page.paginator.ELLIPSIS
+    assert list(page.elided_page_range) == [
+        1, ellipsis, 49_998, 49_999, 50_000, 50_001, 50_002, ellipsis, N_PAGES
+    ], (
+        'Убедитесь, что навигация содержит первую и последнюю страницы, '
+        'соседей текущей и пропуски.'
+    )
+
+
+def test_paginator_template_is_windowed():
+    page = ElidedPaginator(range(N_PAGES), 1).page(1)
+    content = render_to_string('includes/paginator.html', {'page_obj': page})
+    assert content.count('class="page-item') < 10, (
+        'Убедитесь, что шаблон пагинации выводит не все страницы ленты.'
+    )
+    assert f'?page={N_PAGES}"' in content
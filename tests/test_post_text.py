@@ -0,0 +1,72 @@
+from importlib import import_module
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+
+from blog.models import Post
+
+TEXT = 'Первая строка <b>\nодин два три четыре пять шесть семь восемь девять'
+
+
+@pytest.mark.django_db
+def test_text_rendered_on_save(post_with_published_location):
+    post = post_with_published_location
+    post.text = TEXT
+    post.save(update_fields=['text'])
+    post.refresh_from_db()
+    assert post.word_count == 12
+    assert post.excerpt == (
+        'Первая строка <b> один два три четыре пять шесть семь …'
+    ), 'Убедитесь, что начало текста сохраняется при сохранении поста.'
+    assert post.text_html == (
+        'Первая строка &lt;b&gt;<br>один два три четыре пять шесть семь '
+        'восемь девять'
+    ), 'Убедитесь, что HTML текста экранируется и сохраняется.'
+
+
+@pytest.mark.django_db
+def test_feed_defers_text(client, post_with_published_location):
+    response = client.get('/')
+    post = response.context['page_obj'][0]
+    assert {'text', 'text_html'} <= post.get_deferred_fields(), (
+        'Убедитесь, что лента не загружает полный текст публикаций.'
+    )
+    assert post.excerpt in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_backfill_post_text(post_with_published_location):
+    Post.objects.update(text=TEXT, excerpt='', text_html='', word_count=0)
+    call_command('backfill_post_text', stdout=StringIO())
+    post = Post.objects.get()
+    assert post.word_count == 12 and post.text_html, (
+        'Убедитесь, что команда backfill_post_text заполняет '
+        'вычисляемые поля публикаций.'
+    )
+
+
+@pytest.mark.django_db
+def test_migration_renders_existing_posts(post_with_published_location):
+    Post.objects.update(text=TEXT, excerpt='', text_html='', word_count=0)
+    import_module(
+        'blog.migrations.0011_post_excerpt_text_html_word_count'
+    ).render_texts(apps, None)
+    post = Post.objects.get()
+    assert post.word_count == 12 and post.text_html.startswith(
+        'Первая строка &lt;b&gt;<br>'
+    ), (
+        'Убедитесь, что миграция, добавляющая вычисляемые поля, '
+        'заполняет их для существующих публикаций.'
+    )
+
+
+@pytest.mark.django_db
+def test_detail_without_text_html(client, post_with_published_location):
+    Post.objects.update(text=TEXT, text_html='')
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    assert 'Первая строка &lt;b&gt;<br>один' in response.content.decode(), (
+        'Убедитесь, что страница публикации выводит text, пока '
+        'text_html не заполнен.'
+    )
@@ -0,0 +1,55 @@
+import pytest
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = tmp_path
+    settings.PROFILE_SAMPLE_INTERVAL = 0.0005
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_profile_by_header(staff_client, profile_dir, user):
+    response = staff_client.get(
+        f'/profile/{user.username}/', HTTP_X_PROFILE='1'
+    )
+    assert 'X-Profile' in response, (
+        'Убедитесь, что запрос персонала с заголовком X-Profile '
+        'профилируется и ответ содержит ссылку на профиль.'
+    )
+    download = staff_client.get(response['X-Profile'])
+    assert download.status_code == 200, (
+        'Убедитесь, что персонал может скачать сохранённый профиль.'
+    )
+    for line in b''.join(download.streaming_content).decode().splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0 and ';' in stack, (
+            'Убедитесь, что профиль сохраняется в формате collapsed stacks.'
+        )
+
+
+@pytest.mark.django_db
+def test_profile_not_for_others(client, user_client, profile_dir):
+    assert 'X-Profile' not in client.get('/?profile')
+    assert 'X-Profile' not in user_client.get('/?profile')
+    assert not list(profile_dir.iterdir()), (
+        'Убедитесь, что профилируются только запросы персонала.'
+    )
+
+
+@pytest.mark.django_db
+def test_profile_download_staff_only(user_client, staff_client, profile_dir):
+    name = staff_client.get('/?profile')['X-Profile']
+    assert user_client.get(name).status_code in (302, 403), (
+        'Убедитесь, что профили доступны только персоналу.'
+    )
+
+
+@pytest.mark.django_db
+def test_profile_retention(staff_client, profile_dir, settings):
+    settings.PROFILE_MAX_FILES = 2
+    for _ in range(4):
+        staff_client.get('/?profile')
+    assert len(list(profile_dir.iterdir())) == 2, (
+        'Убедитесь, что хранится не больше PROFILE_MAX_FILES профилей.'
+    )
@@ -0,0 +1,148 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from django.test import override_settings
+
+from blog.purge import HttpPurger, LocMemPurger
+
+
+@pytest.fixture
+def purged_keys():
+    LocMemPurger.purged.clear()
+    with override_settings(
+        CACHE_PURGER={'BACKEND': 'blog.purge.LocMemPurger'}
+    ):
+        yield LocMemPurger.purged
+    LocMemPurger.purged.clear()
+
+
+@pytest.mark.django_db
+def test_surrogate_keys_headers(client, post_with_published_location):
+    post = post_with_published_location
+    expected = {
+        f'post:{post.id}',
+        f'author:{post.author.username}',
+        f'category:{post.category.slug}',
+    }
+    for url in (
+        f'/posts/{post.id}/',
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+    ):
+        keys = set(client.get(url)['Surrogate-Key'].split())
+        assert expected <= keys, (
+            f'Убедитесь, что страница `{url}` отдаёт заголовок '
+            '`Surrogate-Key` с ключами публикации, автора и категории.'
+        )
+    assert 'feed' in client.get('/')['Cache-Tag'].split(',')
+
+
+@pytest.mark.django_db
+def test_post_save_purges_keys(
+        purged_keys, post_with_published_location,
+        django_capture_on_commit_callbacks
+):
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = 'Новый заголовок'
+        post.save()
+    assert purged_keys, (
+        'Убедитесь, что сохранение публикации очищает кеш прокси.'
+    )
+    assert {'feed', f'post:{post.id}', f'category:{post.category.slug}'} <= (
+        set(purged_keys[-1])
+    )
+
+
+def test_http_purger_sends_purge_request():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_PURGE(self):
+            received.append((self.command, self.headers['Surrogate-Key']))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    HttpPurger(URL=f'http://127.0.0.1:{server.server_port}/').purge(
+        ['post:1', 'feed']
+    )
+    thread.join()
+    server.server_close()
+    assert received == [('PURGE', 'post:1 feed')]
+
+
+@pytest.mark.django_db
+def test_old_keys_purged_on_change(
+        purged_keys, post_with_published_location, another_category,
+        django_capture_on_commit_callbacks
+):
+    post = post_with_published_location
+    old_key = f'category:{post.category.slug}'
+    with django_capture_on_commit_callbacks(execute=True):
+        post.category = another_category
+        post.save()
+    assert {old_key, f'category:{another_category.slug}'} <= set(
+        purged_keys[-1]
+    ), (
+        'Убедитесь, что при смене категории публикации очищаются страницы '
+        'и старой, и новой категории.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        old_key = f'category:{another_category.slug}'
+        another_category.slug = 'renamed'
+        another_category.save()
+    assert {old_key, 'category:renamed'} <= set(purged_keys[-1])
+
+
+def test_http_purger_survives_dropped_connection():
+    class Handler(BaseHTTPRequestHandler):
+        def handle(self):
+            # Соединение закрывается без ответа: RemoteDisconnected
+            self.rfile.readline()
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    HttpPurger(URL=f'http://127.0.0.1:{server.server_port}/').purge(['feed'])
+    thread.join()
+    server.server_close()
+
+
+def test_http_purger_splits_long_header():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_PURGE(self):
+            received.append(self.headers['Surrogate-Key'])
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    keys = [f'author:user{n}' for n in range(50)]
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    HttpPurger(
+        URL=f'http://127.0.0.1:{server.server_port}/',
+        MAX_HEADER_LENGTH=100
+    ).purge(keys)
+    server.shutdown()
+    thread.join()
+    server.server_close()
+    assert len(received) > 1 and all(
+        len(header) <= 100 for header in received
+    ), (
+        'Убедитесь, что HttpPurger делит ключи на запросы PURGE '
+        'с заголовком не длиннее MAX_HEADER_LENGTH.'
+    )
+    assert ' '.join(received).split() == keys
@@ -0,0 +1,62 @@
+import pytest
+from django.db.models.query_utils import DeferredAttribute
+
+from blog.queries import QueryRecorder, normalize_sql, query_budget
+from blog.querysets import DeferredFieldAccessed, strict_deferred_fields
+from blog.reference import categories
+
+N_COMMENTS = 10
+
+
+def test_normalize_sql():
+    assert normalize_sql(
+        "SELECT * FROM blog_post WHERE id IN (%s, %s, %s) LIMIT 21"
+    ) == normalize_sql(
+        "SELECT * FROM blog_post WHERE id IN (%s) LIMIT 1"
+    )
+
+
+def test_repeated_statements_detected():
+    recorder = QueryRecorder()
+    recorder.statements = [
+        f'SELECT * FROM auth_user WHERE id = {n}' for n in range(5)
+    ]
+    assert recorder.get_violations(budget=None), (
+        'Убедитесь, что повторяющиеся запросы одной формы считаются N+1.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_has_no_n_plus_one(
+        mixer, user_client, post_with_published_location
+):
+    mixer.cycle(N_COMMENTS).blend(
+        'blog.Comment', post=post_with_published_location
+    )
+    with query_budget(8):
+        user_client.get(f'/posts/{post_with_published_location.id}/')
+
+
+@pytest.mark.django_db
+def test_feed_projection(client, post_with_published_location):
+    post = client.get('/').context['page_obj'][0]
+    deferred = post.get_deferred_fields()
+    assert {'text', 'text_html', 'created_at'} <= deferred, (
+        'Убедитесь, что лента загружает только поля карточки публикации.'
+    )
+    assert {'password', 'email'} <= post.author.get_deferred_fields()
+    assert post.category is categories.get(post.category_id), (
+        'Убедитесь, что категории публикаций ленты берутся из памяти процесса.'
+    )
+    with pytest.raises(DeferredFieldAccessed):
+        post.text
+
+
+def test_strict_deferred_fields_restores_django():
+    get = DeferredAttribute.__get__
+    with strict_deferred_fields():
+        assert DeferredAttribute.__get__ is not get
+    assert DeferredAttribute.__get__ is get, (
+        'Убедитесь, что strict_deferred_fields() возвращает исходный '
+        'DeferredAttribute.__get__ после блока.'
+    )
@@ -0,0 +1,35 @@
+import pytest
+from django.core.cache import cache
+
+from blog.cache import GENERATION_KEY
+from blog.forms import PostForm
+from blog.models import Category
+from blog.reference import categories
+
+
+@pytest.mark.django_db
+def test_post_form_choices_cached(
+    post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    PostForm(instance=post).as_p()
+    with django_assert_num_queries(0):
+        content = PostForm(instance=post).as_p()
+    assert str(post.category) in content, (
+        'Убедитесь, что форма публикации выводит категории из кеша.'
+    )
+    assert post.location.name in content
+
+
+@pytest.mark.django_db
+def test_reference_invalidated_by_generation(settings, published_category):
+    settings.REFERENCE_CHECK_INTERVAL = 0
+    categories.get_objects()
+    # Другой процесс изменил категорию и увеличил общее поколение
+    Category.objects.filter(pk=published_category.pk).update(title='Новая')
+    generation_key = GENERATION_KEY.format(categories.generation_name)
+    cache.set(generation_key, cache.get(generation_key, 0) + 1)
+    assert categories.get(published_category.pk).title == 'Новая', (
+        'Убедитесь, что копия справочника перечитывается при смене '
+        'общего поколения.'
+    )
@@ -0,0 +1,37 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+from blog.models import Comment, Post
+
+SEED_OPTIONS = {
+    'users': 3, 'categories': 2, 'locations': 2, 'posts': 5, 'comments': 5,
+}
+
+
+def get_indexes():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name IN ('auth_user', 'blog_post', 'blog_category')"
+        )
+        return {name for name, in cursor.fetchall()}
+
+
+@pytest.mark.django_db
+def test_seed_scale_restores_indexes():
+    indexes = get_indexes()
+    call_command('seed_scale', seed=1, **SEED_OPTIONS)
+    assert Post.objects.count() == 5
+    assert Comment.objects.count() == 5
+    assert get_indexes() == indexes, (
+        'Убедитесь, что seed_scale создаёт удалённые индексы заново.'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('option', ('--users', '--posts', '--categories'))
+def test_seed_scale_rejects_empty_counts(option):
+    with pytest.raises(CommandError):
+        call_command('seed_scale', option, '0')
+    assert not Post.objects.exists()
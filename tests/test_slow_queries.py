@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def slow_query_log(settings, caplog):
+    settings.SLOW_QUERY_THRESHOLD = 0
+    with caplog.at_level(logging.WARNING, logger='blog.slow_queries'):
+        yield caplog
+
+
+@pytest.mark.django_db
+def test_slow_query_log(
+    client, slow_query_log, post_with_published_location
+):
+    client.get(f'/posts/{post_with_published_location.id}/')
+    slow_query_messages = slow_query_log.messages
+    assert slow_query_messages, (
+        'Убедитесь, что запросы дольше SLOW_QUERY_THRESHOLD пишутся '
+        'в журнал blog.slow_queries.'
+    )
+    assert any(
+        "/*controller='PostDetailView',route='blog:post_detail'*/"
+        in message
+        for message in slow_query_messages
+    ), (
+        'Убедитесь, что запросы к БД помечаются комментарием '
+        'с представлением и именем маршрута.'
+    )
+    assert all(
+        'план: ' in message and 'не получен' not in message
+        for message in slow_query_messages
+    ), (
+        'Убедитесь, что в журнал медленных запросов пишется план выполнения.'
+    )
+
+
+@pytest.mark.django_db
+def test_query_stats_disabled_by_default(client, settings):
+    client.get('/')
+    assert not settings.QUERY_STATS_DIR.exists(), (
+        'Убедитесь, что без QUERY_STATS_ENABLED процессы не пишут '
+        'статистику запросов.'
+    )
+
+
+@pytest.mark.django_db
+def test_query_stats_command(
+    client, capsys, settings, post_with_published_location
+):
+    settings.QUERY_STATS_ENABLED = True
+    client.get('/')
+    client.get('/')
+    call_command('query_stats', '--sort', 'count', '--width', '0')
+    output = capsys.readouterr().out
+    assert 'FROM "blog_post"' in output, (
+        'Убедитесь, что команда query_stats выводит формы запросов.'
+    )
+    assert "controller=" not in output, (
+        'Убедитесь, что комментарии не попадают в формы запросов.'
+    )
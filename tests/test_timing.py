@@ -0,0 +1,55 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+from blog import middleware
+
+
+@pytest.mark.django_db
+def test_server_timing_for_staff(staff_client, post_with_published_location):
+    assert 'Server-Timing' not in staff_client.get('/')
+    header = staff_client.get('/', HTTP_X_SERVER_TIMING='1')['Server-Timing']
+    for phase in ('total', 'middleware', 'view', 'db'):
+        assert f'{phase};dur=' in header, (
+            f'Убедитесь, что заголовок Server-Timing содержит фазу {phase}.'
+        )
+    assert 'desc="includes/post_card.html"' in header, (
+        'Убедитесь, что в Server-Timing замеряются включаемые шаблоны.'
+    )
+
+
+@pytest.mark.django_db
+def test_no_server_timing_for_others(client, user_client):
+    assert 'Server-Timing' not in client.get('/', HTTP_X_SERVER_TIMING='1')
+    assert 'Server-Timing' not in user_client.get(
+        '/', HTTP_X_SERVER_TIMING='1'
+    )
+
+
+@pytest.mark.django_db
+def test_unsampled_requests_are_not_timed(user_client, monkeypatch):
+    def fail():
+        raise AssertionError(
+            'Убедитесь, что запросы без выборки и без заголовка '
+            'X-Server-Timing не замеряются.'
+        )
+
+    monkeypatch.setattr(middleware, 'RequestTimings', fail)
+    assert user_client.get('/').status_code == 200
+
+
+@pytest.mark.django_db
+def test_disallowed_host_with_session_cookie(client, tmp_path):
+    # CommonMiddleware отвечает 400 раньше AuthenticationMiddleware
+    client.cookies[settings.SESSION_COOKIE_NAME] = 'unknown'
+    with override_settings(
+        TRAFFIC_SAMPLE_RATE=1, TRAFFIC_LOG_PATH=tmp_path / 'requests.jsonl'
+    ):
+        response = client.get(
+            '/', HTTP_HOST='evil.example', HTTP_X_SERVER_TIMING='1'
+        )
+    assert response.status_code == 400, (
+        'Убедитесь, что замер фаз и запись журнала запросов не ломаются, '
+        'если ответ дан до AuthenticationMiddleware.'
+    )
+    assert 'Server-Timing' not in response
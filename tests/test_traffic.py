@@ -0,0 +1,71 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from django.test import override_settings
+
+from blog.management.commands.replay_traffic import Command as ReplayCommand
+from blog.traffic import get_hot_paths, read_request_log
+
+
+@pytest.mark.django_db
+def test_requests_are_captured(client, tmp_path):
+    log_path = tmp_path / 'requests.jsonl'
+    with override_settings(TRAFFIC_SAMPLE_RATE=1, TRAFFIC_LOG_PATH=log_path):
+        client.get('/')
+        client.get('/pages/about/')
+        client.get('/')
+    records = list(read_request_log(log_path))
+    assert len(records) == 3, (
+        'Убедитесь, что при TRAFFIC_SAMPLE_RATE = 1 в журнал '
+        'записывается каждый запрос.'
+    )
+    assert records[0]['view'] == 'blog:index'
+    assert records[0]['status'] == 200
+    assert records[0]['authenticated'] is False
+    assert records[0]['queries'] > 0
+    assert get_hot_paths(records, 1) == ['/']
+
+
+def test_log_lines_without_path_are_skipped(tmp_path):
+    log_path = tmp_path / 'requests.jsonl'
+    log_path.write_text(
+        json.dumps({'request_id': 'x'}) + '\nnot json\n'
+        + json.dumps({'path': '/'}) + '\n'
+    )
+    assert list(read_request_log(log_path)) == [{'path': '/'}]
+
+
+@pytest.mark.django_db
+def test_secrets_are_not_captured(client, tmp_path):
+    log_path = tmp_path / 'requests.jsonl'
+    with override_settings(TRAFFIC_SAMPLE_RATE=1, TRAFFIC_LOG_PATH=log_path):
+        client.get('/auth/login/', {'next': '/profile/edit/'})
+        client.get('/admin/')
+        client.get('/', {'page': 2, 'email': 'user@example.com'})
+    assert [record['path'] for record in read_request_log(log_path)] == [
+        '/?page=2&email=-'
+    ], (
+        'Убедитесь, что адреса входа и сброса пароля не попадают в журнал, '
+        'а значения параметров запроса, кроме page, скрываются.'
+    )
+
+
+def test_replay_counts_dropped_connection_as_error():
+    class Handler(BaseHTTPRequestHandler):
+        def handle(self):
+            self.rfile.readline()
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    latencies, errors, _ = ReplayCommand().replay(
+        ['/'], f'http://127.0.0.1:{server.server_port}', 1, 0, 2
+    )
+    thread.join()
+    server.server_close()
+    assert errors == {'blog:index': 1}, (
+        'Убедитесь, что обрыв соединения при воспроизведении считается '
+        'ошибкой запроса.'
+    )
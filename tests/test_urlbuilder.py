@@ -0,0 +1,25 @@
+import pytest
+from django.urls import reverse
+
+from blog.urlbuilder import build_url
+
+
+@pytest.mark.parametrize('name, arg', [
+    ('blog:post_detail', 42),
+    ('blog:category_posts', 'travel-2024'),
+    ('blog:profile', 'user.name+tag@example'),
+    ('blog:profile', 'Пользователь'),
+])
+def test_build_url_matches_reverse(name, arg):
+    assert build_url(name, arg) == reverse(name, args=[arg]), (
+        'Убедитесь, что build_url строит тот же адрес, что и reverse.'
+    )
+
+
+@pytest.mark.django_db
+def test_get_absolute_url(post_with_published_location):
+    post = post_with_published_location
+    assert post.get_absolute_url() == f'/posts/{post.id}/'
+    assert post.category.get_absolute_url() == (
+        f'/category/{post.category.slug}/'
+    )
@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.management.commands import warm_cache
+
+
+@pytest.fixture
+def request_log(tmp_path):
+    path = tmp_path / 'requests.jsonl'
+    path.write_text(''.join(
+        json.dumps({'method': 'GET', 'path': path, 'status': 200}) + '\n'
+        for path in ('/', '/', '/pages/about/')
+    ))
+    return path
+
+
+@pytest.mark.django_db(transaction=True)
+def test_warm_cache_fills_shared_feed_cache(
+    client, capsys, request_log, post_with_published_location
+):
+    call_command('warm_cache', '--log', request_log, '--host', 'testserver')
+    assert 'Прогрето 2 из 2' in capsys.readouterr().out
+    with CaptureQueriesContext(connection) as ctx:
+        client.get('/')
+    assert not [
+        query for query in ctx.captured_queries
+        if 'blog_post' in query['sql']
+    ], 'Убедитесь, что warm_cache заполняет кеш ленты.'
+
+
+@pytest.mark.django_db
+def test_warm_cache_refuses_process_local_cache(settings, request_log):
+    settings.CACHE_SHARED = False
+    with pytest.raises(CommandError):
+        call_command('warm_cache', '--log', request_log)
+
+
+def test_failed_fetch_does_not_abort_report():
+    def fetch(path):
+        if path == '/broken/':
+            raise RuntimeError
+        return 200
+
+    results = warm_cache.run_with_budget(fetch, ['/', '/broken/'], 2, 5)
+    assert {path: status for path, (status, _) in results.items()} == {
+        '/': 200,
+        '/broken/': 'RuntimeError',
+    }, (
+        'Убедитесь, что ошибка одного адреса не прерывает прогрев '
+        'остальных и попадает в отчёт.'
+    )
+
+
+def test_budget_is_enforced():
+    started = time.monotonic()
+    results = warm_cache.run_with_budget(
+        lambda path: time.sleep(5), ['/slow/'], 1, 0.2
+    )
+    assert results == {}
+    assert time.monotonic() - started < 1, (
+        'Убедитесь, что warm_cache не ждёт запросы дольше --budget.'
+    )
+
+
+def test_fetch_url_reports_dropped_connection():
+    class Handler(BaseHTTPRequestHandler):
+        def handle(self):
+            self.rfile.readline()
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    status = warm_cache.Command().fetch_url(
+        f'http://127.0.0.1:{server.server_port}/', timeout=2
+    )
+    thread.join()
+    server.server_close()
+    assert status == 'RemoteDisconnected'
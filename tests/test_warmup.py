@@ -0,0 +1,45 @@
+import importlib
+import logging
+
+from django.template import engines
+
+from blog.warmup import warm_up_templates
+
+
+def get_loader():
+    loader = engines['django'].engine.template_loaders[0]
+    loader.reset()
+    return loader
+
+
+def test_templates_warmed_up(caplog):
+    loader = get_loader()
+    with caplog.at_level(logging.WARNING, logger='blog.warmup'):
+        assert warm_up_templates() > 0
+    assert not caplog.records, (
+        'Убедитесь, что все шаблоны проекта компилируются без ошибок.'
+    )
+    for name in (
+        'blog/detail.html',
+        'includes/post_card.html',
+        'includes/category_link.html',
+        'includes/paginator.html',
+    ):
+        assert name in loader.get_template_cache, (
+            f'Убедитесь, что шаблон {name} компилируется при запуске '
+            'и хранится в кеше загрузчика.'
+        )
+    assert not [
+        name for name in loader.get_template_cache
+        if name.startswith(('admin/', 'django_bootstrap5/'))
+    ], (
+        'Убедитесь, что при запуске компилируются только шаблоны проекта.'
+    )
+
+
+def test_asgi_application_warms_up_templates():
+    loader = get_loader()
+    importlib.reload(importlib.import_module('blogicum.asgi'))
+    assert 'blog/detail.html' in loader.get_template_cache, (
+        'Убедитесь, что шаблоны прогреваются и при запуске через ASGI.'
+    )